@@ -0,0 +1,157 @@
+"""Benchmarks for chain overhead and end-to-end throughput.
+
+Run from the repository root:
+
+    python benchmarks/bench_dynamochain.py --sizes 10000 100000 1000000
+
+Results are written as JSON so runs of different releases can be compared.
+"""
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from boto3.dynamodb.conditions import Attr, Key  # noqa: E402
+
+from src.awschains.conditions import ChainsConditionBuilder  # noqa: E402
+from src.awschains.dynamochain import PutItem, Query, Scan  # noqa: E402
+from src.awschains.memory import MemoryTable  # noqa: E402
+
+PARTITIONS = 100
+
+
+def load_table(items=()):
+    table = MemoryTable("bench_table", "ForumName", "Subject")
+    [table.put_item(Item=item) for item in items]
+    return table
+
+
+def generate_items(size: int):
+    for i in range(size):
+        yield {
+            "ForumName": f"Forum {i % PARTITIONS}",
+            "Subject": f"Thread {i:07}",
+            "Message": f"Thread {i} message",
+            "LastPostedBy": f"User {i % 26}",
+            "Views": i % 1000,
+            "Tags": ["bench", f"tag{i % 10}"],
+        }
+
+
+def timed(func, repeat: int = 1):
+    start = perf_counter()
+    [func() for _ in range(repeat)]
+    return (perf_counter() - start) / repeat
+
+
+def bench_build(repeat: int = 10000):
+    def build():
+        ChainsConditionBuilder(
+            {
+                "KeyConditionExpression": Key("ForumName").eq("Forum 1")
+                & Key("Subject").gte("Thread 0000100"),
+                "FilterExpression": Attr("LastPostedBy").eq("User A")
+                | Attr("Views").gt(10),
+                "ProjectionExpression": "ForumName,Subject,Message,Views,Tags",
+            }
+        ).boto3_query
+
+    def chain():
+        (
+            Query(None)
+            .partition_key_exp(Key("ForumName").eq("Forum 1"))
+            .sort_key_exp(Key("Subject").gte("Thread 0000100"))
+            .filter_exp(Attr("LastPostedBy").eq("User A") | Attr("Views").gt(10))
+            .projection_exp("ForumName, Subject, Message, Views, Tags")
+            ._build_requests()
+        )
+
+    return [
+        ("build.boto3_query", None, "seconds_per_op", timed(build, repeat)),
+        ("build.chain_cached", None, "seconds_per_op", timed(chain, repeat)),
+    ]
+
+
+def bench_reads(table: MemoryTable, size: int):
+    results = []
+    for name, chain in [
+        ("scan.run", lambda: Scan(table)),
+        ("scan.prefetch", lambda: Scan(table).prefetch()),
+        (
+            "query.run",
+            lambda: Query(table).partition_key_exp(Key("ForumName").eq("Forum 1")),
+        ),
+    ]:
+        start = perf_counter()
+        count = len(chain().run())
+        seconds = perf_counter() - start
+        results.append((name, size, "items_per_second", count / seconds))
+    seconds = timed(lambda: Scan(table).count())
+    results.append(("scan.count", size, "items_per_second", size / seconds))
+    return results
+
+
+def bench_writes(size: int):
+    table = load_table()
+    items = list(generate_items(size))
+    seconds = timed(lambda: [PutItem(table).attr(item).run() for item in items])
+    return [("put_item.run", size, "items_per_second", size / seconds)]
+
+
+def bench_memory(table: MemoryTable, size: int):
+    results = []
+    for name, consume in [
+        ("memory.run", lambda: len(Scan(table).run())),
+        ("memory.iter_items", lambda: sum(1 for _ in Scan(table).iter_items())),
+    ]:
+        tracemalloc.start()
+        consume()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append((name, size, "peak_bytes", peak))
+    return results
+
+
+def run(sizes, repeat: int = 10000):
+    results = bench_build(repeat)
+    for size in sizes:
+        table = load_table(generate_items(size))
+        results += bench_reads(table, size)
+        results += bench_writes(size)
+        results += bench_memory(table, size)
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "results": [
+            {"name": name, "size": size, "metric": metric, "value": value}
+            for name, size, metric, value in results
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    parser.add_argument("--repeat", type=int, default=10000)
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+    report = run(args.sizes, args.repeat)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    for result in report["results"]:
+        print(
+            f"{result['name']:<20} {str(result['size'] or '-'):>8} "
+            f"{result['metric']:<18} {result['value']:.6g}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""AWS Chains is a wrapper for writing boto3 as method chain.
+
+Importing the package is cheap: each name below is loaded from its module,
+and boto3 with it, on first access.
+"""
+from importlib import import_module
+
+_exports = {
+    "dynamochain": [
+        "BatchGet",
+        "BatchWrite",
+        "Prepared",
+        "PutItem",
+        "Query",
+        "Scan",
+        "TransactWrite",
+        "UpdateItem",
+    ],
+    "conditions": ["ChainsConditionBuilder", "Param", "SharedConditionBuilder"],
+    "asyncchain": ["AsyncPutItem", "AsyncQuery", "AsyncScan", "set_max_workers"],
+    "cache": ["ResultCache"],
+    "checkpoint": ["ScanCheckpoint"],
+    "client": ["ClientTable", "LazyItem"],
+    "combiner": ["UpdateCombiner"],
+    "loader": ["BatchLoader"],
+    "memory": ["MemoryTable"],
+    "metrics": ["MetricsCollector", "add_observer", "remove_observer"],
+    "pool": ["ClientPool", "get_pool", "pooled_table"],
+    "throttle": ["ThroughputController"],
+}
+_modules = {name: module for module, names in _exports.items() for name in names}
+
+__all__ = sorted(_modules)
+
+
+def __getattr__(name: str):
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_modules[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
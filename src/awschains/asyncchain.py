@@ -0,0 +1,95 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from threading import Lock
+
+from .dynamochain import PutItem, Query, Scan
+from .pool import reserve
+
+_shared_executor = None
+_executor_lock = Lock()
+_max_workers = 32
+
+
+def set_max_workers(value: int):
+    global _shared_executor, _max_workers
+    with _executor_lock:
+        _max_workers = value
+        if _shared_executor:
+            _shared_executor.shutdown(wait=False)
+            _shared_executor = None
+
+
+def _default_executor():
+    global _shared_executor
+    with _executor_lock:
+        if not _shared_executor:
+            _shared_executor = ThreadPoolExecutor(
+                max_workers=_max_workers, thread_name_prefix="awschains"
+            )
+        return _shared_executor
+
+
+class AsyncMixin:
+    _executor = None
+
+    def executor(self, value: Executor):
+        self._executor = value
+        return self
+
+    async def _run_in_executor(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        if self._executor:
+            executor = self._executor
+        else:
+            executor = _default_executor()
+            reserve(self._table, _max_workers)
+        return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+    async def run(self):
+        return await self._run_in_executor(super().run)
+
+
+class AsyncMultiReadMixin(AsyncMixin):
+    ITEMS_PER_CALL = 100
+
+    async def count(self, *args, **kwargs):
+        return await self._run_in_executor(super().count, *args, **kwargs)
+
+    async def iter_pages(self):
+        # Each page is fetched on the executor; items are handed out on the loop
+        pages = self.iter()
+        while True:
+            page = await self._run_in_executor(next, pages, None)
+            if page is None:
+                return
+            yield page
+
+    async def __aiter__(self):
+        # Items come from iter_items, which merges fanned out partitions and
+        # applies max_items; they are fetched on the executor a batch at a time
+        items = self.iter_items()
+        try:
+            while True:
+                batch = await self._run_in_executor(
+                    list, islice(items, self.ITEMS_PER_CALL)
+                )
+                if not batch:
+                    return
+                for item in batch:
+                    yield item
+        finally:
+            await self._run_in_executor(items.close)
+
+
+class AsyncQuery(AsyncMultiReadMixin, Query):
+    pass
+
+
+class AsyncScan(AsyncMultiReadMixin, Scan):
+    pass
+
+
+class AsyncPutItem(AsyncMixin, PutItem):
+    pass
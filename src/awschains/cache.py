@@ -0,0 +1,128 @@
+import sys
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+from time import monotonic
+from weakref import WeakSet
+
+_caches = WeakSet()
+_MISSING = object()
+
+
+def _sizeof(value):
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_sizeof(v) for v in value)
+    return size
+
+
+def invalidate_item(table_name: str, item: dict):
+    for cache in list(_caches):
+        cache.invalidate(table_name, item)
+
+
+class ResultCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300):
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._generation = 0
+        _caches.add(self)
+
+    def get_or_load(self, table_name: str, key, partition: dict, load):
+        key = (table_name, key)
+        with self._lock:
+            value = self._lookup(key)
+            generation = self._generation
+        if value is not _MISSING:
+            return value
+        value = load()
+        self._store(key, partition, value, generation)
+        return deepcopy(value)
+
+    def get_many_or_load(self, table_name: str, partitions: dict, load):
+        # The keys missing from the cache are loaded together: load takes them
+        # and returns their values by key
+        with self._lock:
+            values = {key: self._lookup((table_name, key)) for key in partitions}
+            generation = self._generation
+        missing = [key for key, value in values.items() if value is _MISSING]
+        if missing:
+            loaded = load(missing)
+            for key in missing:
+                value = loaded.get(key)
+                self._store((table_name, key), partitions[key], value, generation)
+                values[key] = deepcopy(value)
+        return values
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry and entry[0] > monotonic():
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return deepcopy(entry[1])
+        if entry:
+            self._remove(key)
+            self._evictions += 1
+        self._misses += 1
+        return _MISSING
+
+    def _store(self, key, partition: dict, value, generation: int):
+        size = _sizeof(value)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            # A write landed while loading, so the value may already be stale
+            if generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (monotonic() + self._ttl, value, partition, size)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key):
+        self._bytes -= self._entries.pop(key)[3]
+
+    def invalidate(self, table_name: str, item: dict = None):
+        # An entry is stale when the item satisfies every key equality it was
+        # read with; entries without equalities (e.g. Scan) span the table
+        with self._lock:
+            stale = [
+                key
+                for key, (_, _, partition, _) in self._entries.items()
+                if key[0] == table_name
+                and (
+                    item is None
+                    or all(item.get(name) == value for name, value in partition.items())
+                )
+            ]
+            [self._remove(key) for key in stale]
+            self._invalidations += len(stale)
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "Hits": self._hits,
+                "Misses": self._misses,
+                "Evictions": self._evictions,
+                "Invalidations": self._invalidations,
+                "Entries": len(self._entries),
+                "Bytes": self._bytes,
+            }
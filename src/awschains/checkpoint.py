@@ -0,0 +1,92 @@
+import json
+import os
+from base64 import b64decode, b64encode
+from threading import Lock
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+class ScanCheckpoint:
+    def __init__(self, path: str, every: int = 1):
+        self._path = path
+        self._every = every
+        self._lock = Lock()
+        self._pages = 0
+        self._total_segments = None
+        self._segments = {}
+
+    def load(self, total_segments: int = None):
+        if not os.path.exists(self._path):
+            self._total_segments = total_segments
+            self._segments = {}
+            return
+        with open(self._path) as f:
+            state = json.load(f)
+        if state["TotalSegments"] != total_segments:
+            raise ValueError(
+                f"Checkpoint was taken with TotalSegments={state['TotalSegments']}."
+            )
+        self._total_segments = total_segments
+        self._segments = {
+            int(segment): {
+                "LastEvaluatedKey": self._deserialize(cursor["LastEvaluatedKey"]),
+                "Done": cursor["Done"],
+            }
+            for segment, cursor in state["Segments"].items()
+        }
+
+    def is_done(self, segment: int = 0):
+        return self._segments.get(segment, {}).get("Done", False)
+
+    def start_key(self, segment: int = 0):
+        return self._segments.get(segment, {}).get("LastEvaluatedKey")
+
+    def record(self, segment: int, last_evaluated_key: dict = None):
+        # Called once the caller has consumed a page, so a resume never skips it
+        with self._lock:
+            self._segments[segment] = {
+                "LastEvaluatedKey": last_evaluated_key,
+                "Done": last_evaluated_key is None,
+            }
+            self._pages += 1
+            if last_evaluated_key is None or self._pages % self._every == 0:
+                self._save()
+
+    def _save(self):
+        state = {
+            "TotalSegments": self._total_segments,
+            "Segments": {
+                str(segment): {
+                    "LastEvaluatedKey": self._serialize(cursor["LastEvaluatedKey"]),
+                    "Done": cursor["Done"],
+                }
+                for segment, cursor in self._segments.items()
+            },
+        }
+        temporary = f"{self._path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(state, f)
+        os.replace(temporary, self._path)
+
+    @staticmethod
+    def _serialize(key: dict):
+        if key is None:
+            return None
+        serialized = {k: _serializer.serialize(v) for k, v in key.items()}
+        # Binary key attributes are the only ones JSON cannot hold as they are
+        return {
+            k: {"B": b64encode(bytes(v["B"])).decode()} if "B" in v else v
+            for k, v in serialized.items()
+        }
+
+    @staticmethod
+    def _deserialize(key: dict):
+        if key is None:
+            return None
+        return {
+            k: _deserializer.deserialize({"B": b64decode(v["B"])} if "B" in v else v)
+            for k, v in key.items()
+        }
@@ -0,0 +1,245 @@
+from collections.abc import Mapping
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+from boto3.dynamodb.types import TypeSerializer
+
+_serializer = TypeSerializer()
+_TRANSACT_ATTRIBUTES = ("Item", "Key")
+
+
+def _native_number(value: str):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def make_deserializer(numbers: str = "decimal"):
+    if numbers not in ("decimal", "native"):
+        raise ValueError("numbers should be 'decimal' or 'native'.")
+    number = Decimal if numbers == "decimal" else _native_number
+
+    # Tags are checked in rough order of frequency on typical items
+    def deserialize(value: dict):
+        ((tag, data),) = value.items()
+        if tag == "S":
+            return data
+        if tag == "N":
+            return number(data)
+        if tag == "M":
+            return {k: deserialize(v) for k, v in data.items()}
+        if tag == "L":
+            return [deserialize(v) for v in data]
+        if tag == "BOOL" or tag == "B":
+            return data
+        if tag == "NULL":
+            return None
+        if tag == "SS" or tag == "BS":
+            return set(data)
+        if tag == "NS":
+            return {number(v) for v in data}
+        raise TypeError(f"Unknown DynamoDB type: {tag}")
+
+    return deserialize
+
+
+class LazyItem(Mapping):
+    """Read-only view over a wire-format item.
+
+    Each attribute is deserialized on first access and then kept.
+    """
+
+    __slots__ = ("_raw", "_values", "_deserialize")
+
+    def __init__(self, raw: dict, deserialize):
+        self._raw = raw
+        self._values = {}
+        self._deserialize = deserialize
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = self._deserialize(self._raw[key])
+            return value
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __repr__(self):
+        return f"LazyItem({self._raw!r})"
+
+    def to_dict(self):
+        return {key: self[key] for key in self._raw}
+
+
+def _decimalize(value):
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    if isinstance(value, dict):
+        return {k: _decimalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_decimalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {_decimalize(v) for v in value}
+    return value
+
+
+def serialize(value):
+    return _serializer.serialize(_decimalize(value))
+
+
+_deserialize = make_deserializer()
+
+
+def _serialize_item(item: dict):
+    return {k: serialize(v) for k, v in item.items()}
+
+
+def _deserialize_item(item: dict):
+    return {k: _deserialize(v) for k, v in item.items()}
+
+
+def _convert_request(request: dict, convert):
+    if "PutRequest" in request:
+        return {"PutRequest": {"Item": convert(request["PutRequest"]["Item"])}}
+    return {"DeleteRequest": {"Key": convert(request["DeleteRequest"]["Key"])}}
+
+
+class ClientTable:
+    """Table stand-in that drives the low-level client.
+
+    Items come back through a fast deserializer, or untouched in wire format
+    when ``numbers`` is ``"raw"``. With ``lazy`` they come back as LazyItem
+    views that deserialize attributes on access. LastEvaluatedKey is always kept in wire
+    format since it is only handed back to DynamoDB. The batch and transaction
+    chains call the table itself, since it has no resource client under
+    ``meta``; unprocessed entries come back in native values so they can be
+    resubmitted.
+    """
+
+    def __init__(
+        self,
+        client,
+        table_name: str,
+        numbers: str = "decimal",
+        lazy: bool = False,
+    ):
+        self._client = client
+        self.name = table_name
+        self._deserialize = None if numbers == "raw" else make_deserializer(numbers)
+        self._lazy = lazy and self._deserialize is not None
+
+    @property
+    def client(self):
+        return self._client
+
+    def query(self, **requests):
+        return self._read(self._client.query, requests)
+
+    def scan(self, **requests):
+        return self._read(self._client.scan, requests)
+
+    def put_item(self, **requests):
+        requests["Item"] = _serialize_item(requests["Item"])
+        if isinstance(requests.get("ConditionExpression"), ConditionBase):
+            expression = ConditionExpressionBuilder().build_expression(
+                requests["ConditionExpression"]
+            )
+            requests["ConditionExpression"] = expression.condition_expression
+            # DynamoDB rejects empty placeholder maps, e.g. for attribute_not_exists
+            if expression.attribute_name_placeholders:
+                requests[
+                    "ExpressionAttributeNames"
+                ] = expression.attribute_name_placeholders
+            if expression.attribute_value_placeholders:
+                requests[
+                    "ExpressionAttributeValues"
+                ] = expression.attribute_value_placeholders
+        return self._client.put_item(TableName=self.name, **self._serialize(requests))
+
+    def update_item(self, **requests):
+        requests["Key"] = _serialize_item(requests["Key"])
+        response = self._client.update_item(
+            TableName=self.name, **self._serialize(requests)
+        )
+        if "Attributes" in response:
+            response["Attributes"] = _deserialize_item(response["Attributes"])
+        return response
+
+    def batch_get_item(self, RequestItems: dict, **requests):
+        response = self._client.batch_get_item(
+            RequestItems={
+                name: self._serialize(
+                    request | {"Keys": [_serialize_item(x) for x in request["Keys"]]}
+                )
+                for name, request in RequestItems.items()
+            },
+            **requests,
+        )
+        response["Responses"] = {
+            name: self._items(items) for name, items in response["Responses"].items()
+        }
+        response["UnprocessedKeys"] = {
+            name: request | {"Keys": [_deserialize_item(x) for x in request["Keys"]]}
+            for name, request in response.get("UnprocessedKeys", {}).items()
+        }
+        return response
+
+    def batch_write_item(self, RequestItems: dict, **requests):
+        response = self._client.batch_write_item(
+            RequestItems={
+                name: [_convert_request(x, _serialize_item) for x in items]
+                for name, items in RequestItems.items()
+            },
+            **requests,
+        )
+        response["UnprocessedItems"] = {
+            name: [_convert_request(x, _deserialize_item) for x in items]
+            for name, items in response.get("UnprocessedItems", {}).items()
+        }
+        return response
+
+    def transact_write_items(self, TransactItems: list, **requests):
+        items = [
+            {
+                kind: self._serialize(
+                    operation
+                    | {
+                        name: _serialize_item(operation[name])
+                        for name in _TRANSACT_ATTRIBUTES
+                        if name in operation
+                    }
+                )
+            }
+            for item in TransactItems
+            for kind, operation in item.items()
+        ]
+        return self._client.transact_write_items(TransactItems=items, **requests)
+
+    def _read(self, func, requests):
+        response = func(TableName=self.name, **self._serialize(requests))
+        if "Items" in response:
+            response["Items"] = self._items(response["Items"])
+        return response
+
+    def _items(self, items: list):
+        deserialize = self._deserialize
+        if self._lazy:
+            return [LazyItem(item, deserialize) for item in items]
+        if deserialize:
+            return [{k: deserialize(v) for k, v in item.items()} for item in items]
+        return items
+
+    @staticmethod
+    def _serialize(requests: dict):
+        if "ExpressionAttributeValues" in requests:
+            requests["ExpressionAttributeValues"] = {
+                k: serialize(v)
+                for k, v in requests["ExpressionAttributeValues"].items()
+            }
+        return requests
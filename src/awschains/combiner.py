@@ -0,0 +1,124 @@
+from threading import Lock, Timer
+
+from botocore.exceptions import ClientError
+
+from .dynamochain import ItemMixin, UpdateItem
+
+
+def _key_id(key: dict):
+    return tuple(sorted(key.items()))
+
+
+def _combine(current, value):
+    if current is None:
+        return value
+    if isinstance(value, (set, frozenset)):
+        return current | value
+    return current + value
+
+
+class UpdateCombiner:
+    """Buffer of increments and set-adds merged into one ADD update per key.
+
+    Buffered deltas are written when ``max_keys`` distinct keys are pending or
+    ``window`` seconds after the first delta, whichever comes first. Every key
+    of a batch is attempted; deltas DynamoDB rejected as throttled or failed
+    internally go back to the buffer, and other rejections are dropped.
+    ``add`` never raises, since its delta is buffered either way: errors of
+    writes it or the timer started are kept in ``errors`` and the first one is
+    raised from the next ``flush``.
+    """
+
+    RETRYABLE_ERRORS = {
+        "ProvisionedThroughputExceededException",
+        "ThrottlingException",
+        "RequestLimitExceeded",
+        "InternalServerError",
+    }
+
+    def __init__(self, table, window: float = 1.0, max_keys: int = 100) -> None:
+        self._table = table
+        self._window = window
+        self._max_keys = max_keys
+        self._pending = {}
+        self._timer = None
+        self._lock = Lock()
+        self._write_lock = Lock()
+        self._errors = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+    def add(self, key, name: str, value=1):
+        if isinstance(key, ItemMixin):
+            key = key._item
+        key_id = _key_id(key)
+        with self._lock:
+            _, deltas = self._pending.setdefault(key_id, (key, {}))
+            deltas[name] = _combine(deltas.get(name), value)
+            full = len(self._pending) >= self._max_keys
+            if not full and not self._timer:
+                self._timer = Timer(self._window, self._write_pending)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self._write_pending()
+        return self
+
+    @property
+    def errors(self):
+        with self._lock:
+            return list(self._errors)
+
+    def flush(self):
+        self._write_pending()
+        self._raise()
+
+    def _write_pending(self):
+        # Writes are serialized, so a flush also waits for a timed one in flight
+        with self._write_lock:
+            with self._lock:
+                batch = self._take()
+            if batch:
+                self._write(batch)
+
+    def _raise(self):
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def _take(self):
+        batch, self._pending = self._pending, {}
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _write(self, batch: dict):
+        errors = []
+        rejected = {}
+        for key_id, (key, deltas) in batch.items():
+            try:
+                UpdateItem(self._table).attr(key).add(deltas).run()
+            except ClientError as e:
+                # DynamoDB answered, so the ADD was not applied; it is buffered
+                # again unless retrying would fail the same way
+                if e.response["Error"]["Code"] in self.RETRYABLE_ERRORS:
+                    rejected[key_id] = (key, deltas)
+                errors.append(e)
+            except Exception as e:
+                # Without an answer the ADD may have been applied, and
+                # retrying it could count it twice
+                errors.append(e)
+        if not errors:
+            return
+        with self._lock:
+            for key_id, (key, deltas) in rejected.items():
+                _, pending = self._pending.setdefault(key_id, (key, {}))
+                for name, value in deltas.items():
+                    pending[name] = _combine(pending.get(name), value)
+            self._errors.extend(errors)
@@ -0,0 +1,258 @@
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+
+from boto3.dynamodb.conditions import (
+    AttributeBase,
+    ConditionBase,
+    ConditionExpressionBuilder,
+)
+
+
+class ChainsCondition:
+    def __init__(self):
+        self._key = {}
+        self._projection_exp = ""
+        self._key_condition_exp = None
+        self._filter_exp = None
+        self._scan_index_forward = None
+        self._consistent_read = None
+
+    @property
+    def key(self):
+        return self._key
+
+    @key.setter
+    def key(self, value: dict):
+        self._key |= value
+
+    def key_condition_exp(self, value):
+        if not self._key_condition_exp:
+            self._key_condition_exp &= value
+        else:
+            self._key_condition_exp = value
+
+    def projection_exp(self, value):
+        if not self._projection_exp:
+            self._projection_exp += "," + value
+        else:
+            self._projection_exp = value
+
+    def asc(self):
+        self._scan_index_forward = True
+
+    def desc(self):
+        self._scan_index_forward = False
+
+    def limit(self, num: int):
+        self._limit = num
+
+    def condition_exp(self, ce):
+        self._condition_exp = ce
+
+    def filter_exp(self, fe):
+        self._filter_exp = fe
+
+    def consistent_read(self, cr=True):
+        self._consistent_read = cr
+
+
+@lru_cache(maxsize=1024)
+def parse_projection(value: str):
+    paths = []
+    for path in value.split(","):
+        elements = []
+        for name in path.strip().split("."):
+            name, *indexes = name.split("[")
+            if not name:
+                raise ValueError(f"Invalid projection path: {path.strip()!r}")
+            elements.append(name)
+            for index in indexes:
+                if not index.endswith("]") or not index[:-1].isdigit():
+                    raise ValueError(f"Invalid projection path: {path.strip()!r}")
+                elements.append(int(index[:-1]))
+        paths.append(tuple(elements))
+    return tuple(paths)
+
+
+class ChainsConditionBuilder(ConditionExpressionBuilder):
+    def __init__(self, query: ChainsCondition):
+        super().__init__()
+        self._query = query
+
+    def _build_key_condition_expression(self):
+        self._build_expression_to_query("KeyConditionExpression", is_key_condition=True)
+
+    def _build_filter_expression(self):
+        self._build_expression_to_query("FilterExpression")
+
+    def _build_expression_to_query(self, key, is_key_condition=False):
+        if key not in self._query:
+            return
+        bce = self.build_expression(self._query[key], is_key_condition=is_key_condition)
+        self.expression_attribute_names |= bce.attribute_name_placeholders
+        self.expression_attribute_values |= bce.attribute_value_placeholders
+        self._query[key] = bce.condition_expression
+
+    def _build_projection_expression(self):
+        if "ProjectionExpression" not in self._query:
+            return
+        if type(self._query["ProjectionExpression"]) is not str:
+            raise TypeError("ProjectionExpression should have str specified.")
+        paths = parse_projection(self._query["ProjectionExpression"])
+        placeholders = {v: k for k, v in self.expression_attribute_names.items()}
+        names = {}
+        compiled = []
+        for path in paths:
+            elements = []
+            for element in path:
+                if type(element) is int:
+                    elements.append(f"[{element}]")
+                    continue
+                if element not in placeholders:
+                    placeholder = f"#{self._name_placeholder}{self._name_count}"
+                    self._name_count += 1
+                    placeholders[element] = placeholder
+                    names[placeholder] = element
+                elements.append(("." if elements else "") + placeholders[element])
+            compiled.append("".join(elements))
+        if names:
+            self.expression_attribute_names = names
+        self._query["ProjectionExpression"] = ",".join(compiled)
+
+    @property
+    def expression_attribute_names(self):
+        if "ExpressionAttributeNames" not in self._query:
+            return {}
+        else:
+            return self._query["ExpressionAttributeNames"]
+
+    @expression_attribute_names.setter
+    def expression_attribute_names(self, value):
+        if "ExpressionAttributeNames" not in self._query:
+            self._query["ExpressionAttributeNames"] = value
+        else:
+            self._query["ExpressionAttributeNames"] |= value
+
+    @property
+    def expression_attribute_values(self):
+        if "ExpressionAttributeValues" not in self._query:
+            return {}
+        else:
+            return self._query["ExpressionAttributeValues"]
+
+    @expression_attribute_values.setter
+    def expression_attribute_values(self, value):
+        if "ExpressionAttributeValues" not in self._query:
+            self._query["ExpressionAttributeValues"] = value
+        else:
+            self._query["ExpressionAttributeValues"] |= value
+
+    @property
+    def boto3_query(self):
+        # ここでboto3用のqueryを生成して
+        self._build_key_condition_expression()
+        self._build_filter_expression()
+        self._build_projection_expression()
+        return self._query
+
+
+class SharedConditionBuilder(ConditionExpressionBuilder):
+    """Placeholder allocator shared by every operation of one request"""
+
+    def add_condition(self, operation: dict, condition, key="ConditionExpression"):
+        bce = self.build_expression(condition)
+        operation[key] = bce.condition_expression
+        self._merge(operation, bce.attribute_name_placeholders, "Names")
+        self._merge(operation, bce.attribute_value_placeholders, "Values")
+        return operation
+
+    def name(self, operation: dict, name: str):
+        placeholder = self._get_name_placeholder()
+        self._name_count += 1
+        self._merge(operation, {placeholder: name}, "Names")
+        return placeholder
+
+    def value(self, operation: dict, value):
+        placeholder = self._get_value_placeholder()
+        self._value_count += 1
+        self._merge(operation, {placeholder: value}, "Values")
+        return placeholder
+
+    @staticmethod
+    def _merge(operation: dict, placeholders: dict, kind: str):
+        if placeholders:
+            operation.setdefault(f"ExpressionAttribute{kind}", {}).update(placeholders)
+
+
+class Param:
+    """Named bind value resolved when a prepared chain runs"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f"Param({self.name!r})"
+
+
+def request_shape(value):
+    if isinstance(value, ConditionBase):
+        expression = value.get_expression()
+        return (
+            expression["operator"],
+            expression["format"],
+            tuple(request_shape(v) for v in expression["values"]),
+        )
+    if isinstance(value, AttributeBase):
+        return (type(value).__name__, value.name)
+    if isinstance(value, Param):
+        return ("Param", value.name)
+    if isinstance(value, dict):
+        return tuple((k, request_shape(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(request_shape(v) for v in value)
+    return (type(value).__name__, repr(value))
+
+
+class CompiledQueryCache:
+    def __init__(self, maxsize: int = 1024):
+        self._maxsize = maxsize
+        self._queries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, query: dict):
+        key = request_shape(query)
+        with self._lock:
+            compiled = self._queries.get(key)
+            if compiled is not None:
+                self._queries.move_to_end(key)
+        if compiled is None:
+            compiled = ChainsConditionBuilder(dict(query)).boto3_query
+            with self._lock:
+                self._queries[key] = compiled
+                if len(self._queries) > self._maxsize:
+                    self._queries.popitem(last=False)
+        return dict(compiled)
+
+    def clear(self):
+        with self._lock:
+            self._queries.clear()
+
+
+compiled_query_cache = CompiledQueryCache()
+
+
+def bind(query: dict, values: dict):
+    attribute_values = query.get("ExpressionAttributeValues")
+    if not attribute_values:
+        return query
+    bound = {}
+    for placeholder, value in attribute_values.items():
+        if isinstance(value, Param):
+            if value.name not in values:
+                raise ValueError(f"No value bound to {value!r}.")
+            value = values[value.name]
+        bound[placeholder] = value
+    return query | {"ExpressionAttributeValues": bound}
@@ -1,21 +1,124 @@
+import sys
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
 from functools import singledispatchmethod
-from itertools import chain
+from heapq import merge
+from operator import itemgetter
+from queue import Full, Queue
+from threading import Event
+from time import perf_counter
+from typing import TYPE_CHECKING
+from uuid import uuid4
 
-from boto3.dynamodb.conditions import ComparisonCondition, Equals
+from boto3.dynamodb.conditions import ComparisonCondition, Equals, Key
+from botocore.exceptions import ClientError
 
-from conditions import ChainsConditionBuilder
+from .conditions import (
+    ChainsConditionBuilder,
+    Param,
+    SharedConditionBuilder,
+    bind,
+    compiled_query_cache,
+    request_shape,
+)
+
+# Caches, metrics and throttling load on first use, like records, plans,
+# checkpoints and pools, to keep the import cheap for cold starts
+if TYPE_CHECKING:
+    from .cache import ResultCache
+    from .throttle import ThroughputController
+
+
+def _loaded(name: str):
+    return sys.modules.get(f"{__package__}.{name}")
+
+
+def invalidate_item(table_name: str, item: dict):
+    # Only a loaded cache module can hold entries to invalidate
+    cache = _loaded("cache")
+    if cache:
+        cache.invalidate_item(table_name, item)
 
 
 class AccessorBase(metaclass=ABCMeta):
+    _capacity_kind = "read"
+
     def __init__(self, table) -> None:
         self._table = table
         self._return_consumed_capacity = "NONE"
+        self._controller = None
+        self._observers = []
+        self._build_time = 0
 
     def return_consumed_capacity(self, value: str):
         self._return_consumed_capacity = value
         return self
 
+    def throttle(self, value: "ThroughputController"):
+        self._controller = value
+        # Pacing needs the capacity reported back by every call
+        if self._return_consumed_capacity == "NONE":
+            self._return_consumed_capacity = "TOTAL"
+        return self
+
+    def observe(self, observer):
+        self._observers = self._observers + [observer]
+        return self
+
+    def _call(self, func, **requests):
+        # Global observers are registered through the metrics module, so there
+        # are none until it is loaded
+        metrics = _loaded("metrics")
+        observers = self._observers + (metrics.global_observers() if metrics else [])
+        if not observers:
+            return self._send(func, **requests)
+        from .metrics import response_bytes
+        from .throttle import consumed_capacity_units
+
+        attempts = 0
+
+        def counted(**requests):
+            nonlocal attempts
+            attempts += 1
+            return func(**requests)
+
+        start = perf_counter()
+        response = self._send(counted, **requests)
+        wall_time = perf_counter() - start
+        retries = response.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        event = {
+            "Operation": type(self).__name__,
+            "TableName": getattr(self._table, "name", None),
+            "WallTime": wall_time,
+            # Requests are built once per iter(), so only its first page pays
+            "BuildTime": self.__dict__.pop("_build_time", 0),
+            "Count": response.get("Count"),
+            "ScannedCount": response.get("ScannedCount"),
+            "Bytes": response_bytes(response),
+            "ConsumedCapacityUnits": consumed_capacity_units(response),
+            "RetryCount": attempts - 1 + retries,
+        }
+        [observer(event) for observer in observers]
+        return response
+
+    def _reserve(self, workers: int):
+        from .pool import reserve
+
+        reserve(self._table, workers)
+
+    def _client(self):
+        # Batch and transaction calls go through the resource client of boto3
+        # tables; stand-ins without one, such as ClientTable, answer them
+        if hasattr(self._table, "meta"):
+            return self._table.meta.client
+        return self._table
+
+    def _send(self, func, **requests):
+        if not self._controller:
+            return func(**requests)
+        return self._controller.call(self._capacity_kind, func, **requests)
+
     @abstractmethod
     def run(self):
         pass
@@ -27,6 +130,7 @@ class ReadBase(AccessorBase):
         self._key_condition_exp = None
         self._projection_exps = []
         self._consistent_read = False
+        self._cache = None
 
     def projection_exp(self, value: str):
         self._projection_exps.extend([x.strip() for x in value.split(",")])
@@ -36,12 +140,18 @@ class ReadBase(AccessorBase):
         self._consistent_read = value
         return self
 
+    def cache(self, value: "ResultCache"):
+        self._cache = value
+        return self
+
     @abstractmethod
     def run(self):
         pass
 
 
 class WriteBase(AccessorBase):
+    _capacity_kind = "write"
+
     def __init__(self, table) -> None:
         super().__init__(table)
         self._condition_exp = None
@@ -65,6 +175,10 @@ class MultiReadBase(ReadBase):
         self._limit = None
         self._select = ""
         self._exclusive_start_key = None
+        self._prefetch = False
+        self._max_items = None
+        self._binds = {}
+        self._index_name = None
 
     def limit(self, value: int):
         self._limit = value
@@ -81,8 +195,22 @@ class MultiReadBase(ReadBase):
         self._select = value
         return self
 
+    def index_name(self, value: str):
+        self._index_name = value
+        return self
+
+    def max_items(self, value: int):
+        self._max_items = value
+        return self
+
+    def prefetch(self, value: bool = True):
+        self._prefetch = value
+        return self
+
     def _create_requests(self):
         requests = {}
+        if self._index_name:
+            requests["IndexName"] = self._index_name
         if self._key_condition_exp:
             requests["KeyConditionExpression"] = self._key_condition_exp
         if self._projection_exps:
@@ -96,36 +224,338 @@ class MultiReadBase(ReadBase):
             requests["Select"] = self._select
         if self._exclusive_start_key:
             requests["ExclusiveStartKey"] = self._exclusive_start_key
+        if self._return_consumed_capacity != "NONE":
+            requests["ReturnConsumedCapacity"] = self._return_consumed_capacity
         return requests
 
+    def _compile_requests(self):
+        requests = self._create_requests()
+        requests.pop("ExclusiveStartKey", None)
+        return compiled_query_cache.get(requests)
+
+    def _build_requests(self):
+        start = perf_counter()
+        requests = bind(self._compile_requests(), self._binds)
+        self._build_time = perf_counter() - start
+        return requests
+
+    def prepare(self):
+        return Prepared(self)
+
+    def _clone(self):
+        clone = copy(self)
+        clone._projection_exps = list(self._projection_exps)
+        clone._exclusive_start_key = None
+        return clone
+
     def run(self):
-        return list(chain(*[record["Items"] for record in self.iter()]))
+        return self._cached("run", lambda: list(self.iter_items()))
+
+    # Records, columns, plans, checkpoints and pools load on first use to keep
+    # the import cheap for cold starts
+    def iter_records(self):
+        from .results import projection_fields, to_records
+
+        fields = projection_fields(self._projection_exps)
+        return to_records(self.iter_items(), fields)
+
+    def run_records(self):
+        return self._cached("run_records", lambda: list(self.iter_records()))
+
+    def iter_columns(self, batch_size: int = 10000, use_numpy: bool = False):
+        from .results import projection_fields, to_columns
+
+        fields = projection_fields(self._projection_exps)
+        return to_columns(self.iter_items(), fields, batch_size, use_numpy)
 
-    def count(self):
-        self.select("COUNT")
+    def run_columns(self, use_numpy: bool = False):
+        from .results import projection_fields, to_columns
+
+        fields = projection_fields(self._projection_exps)
+        columns = to_columns(self.iter_items(), fields, None, use_numpy)
+        return next(columns, {field: [] for field in fields})
+
+    def _cached(self, name: str, load):
+        if not self._cache:
+            return load()
+        return self._cache.get_or_load(
+            self._table.name, (name, self._cache_key()), self._key_equalities(), load
+        )
+
+    def _cache_key(self):
+        return request_shape(self._build_requests()), self._max_items
+
+    def _key_equalities(self):
+        # Index keys can change under a write that only carries the table key,
+        # so reads of an index are invalidated by any write to the table
+        if self._index_name:
+            return {}
+        equalities = {}
+        conditions = [self._key_condition_exp] if self._key_condition_exp else []
+        while conditions:
+            expression = conditions.pop().get_expression()
+            if expression["operator"] == "AND":
+                conditions.extend(expression["values"])
+            elif expression["operator"] == "=":
+                attr, value = expression["values"]
+                if isinstance(value, Param):
+                    value = self._binds.get(value.name)
+                equalities[attr.name] = value
+        return equalities
+
+    def iter_items(self):
+        if self._max_items is not None and self._max_items <= 0:
+            return
+        returned = 0
+        for response in self.iter():
+            # Release each item from the page as soon as it has been handed out
+            items = response.pop("Items", [])[::-1]
+            while items:
+                yield items.pop()
+                returned += 1
+                if returned == self._max_items:
+                    return
+
+    def count(self, approximate: bool = False):
+        if approximate and not (self._filter_exp or self._key_condition_exp):
+            from .planner import item_count
+
+            return item_count(self._table, self._index_name)
+        # Count on a clone so the chain itself still returns items afterwards
+        chain = self._clone().select("COUNT")
+        chain._projection_exps = []
+        return self._cached("count", chain._count)
+
+    def _count(self):
         return sum([record["Count"] for record in self.iter()])
 
-    @abstractmethod
     def iter(self):
+        requests = self._build_requests()
+        if self._prefetch:
+            yield from self._iter_prefetch(requests)
+            return
+        while True:
+            response = self._fetch(requests)
+            yield response
+            if "LastEvaluatedKey" not in response:
+                break
+
+    def _iter_prefetch(self, requests):
+        # Fetch page N+1 in the background while the caller consumes page N
+        self._reserve(2)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._fetch, requests)
+            while future:
+                response = future.result()
+                if "LastEvaluatedKey" in response:
+                    future = executor.submit(self._fetch, requests)
+                else:
+                    future = None
+                yield response
+
+    def _fetch(self, requests):
+        if self._exclusive_start_key:
+            requests = requests | {"ExclusiveStartKey": self._exclusive_start_key}
+        response = self._call(self._request, **requests)
+        self._exclusive_start_key = response.get("LastEvaluatedKey")
+        return response
+
+    @abstractmethod
+    def _request(self, **requests):
         pass
 
 
 class Scan(MultiReadBase):
+    PAGES_PER_WORKER = 2
+
     def __init__(self, table) -> None:
         super().__init__(table)
+        self._total_segments = None
+        self._max_workers = None
+        self._group_by_segment = False
+        self._segment_start_keys = {}
+        self._checkpoint = None
+        self._auto_plan = False
+
+    def parallel(
+        self,
+        total_segments: int,
+        max_workers: int = None,
+        group_by_segment: bool = False,
+    ):
+        if total_segments < 1:
+            raise ValueError("total_segments should be 1 or more.")
+        self._total_segments = total_segments
+        self._max_workers = max_workers or total_segments
+        self._group_by_segment = group_by_segment
+        return self
+
+    def auto_plan(self, value: bool = True):
+        self._auto_plan = value
+        return self
+
+    def _plan(self):
+        from .planner import plan_scan
+
+        return plan_scan(
+            self._table,
+            self._filter_exp,
+            self._projection_exps,
+            self._consistent_read,
+            self._index_name,
+        )
+
+    def explain(self):
+        return self._plan().explain()
+
+    def planned(self):
+        from .planner import key_condition
+
+        plan = self._plan()
+        if not plan.path:
+            return self
+        query = Query(self._table)
+        query.__dict__ |= {
+            key: value
+            for key, value in self.__dict__.items()
+            if key in query.__dict__
+            and key not in ("_filter_exp", "_exclusive_start_key")
+        }
+        query._projection_exps = list(self._projection_exps)
+        query.index_name(plan.path["IndexName"])
+        query.partition_key_exp(key_condition(plan.partition))
+        if plan.sort is not None:
+            query.sort_key_exp(key_condition(plan.sort))
+        for condition in plan.residual:
+            query.filter_exp(condition)
+        return query
+
+    def checkpoint(self, path: str, every: int = 1):
+        from .checkpoint import ScanCheckpoint
+
+        self._checkpoint = ScanCheckpoint(path, every)
+        return self
 
     def iter(self):
-        requests = self._create_requests()
-        response = self._table.scan(**ChainsConditionBuilder(requests).boto3_query)
-        if "LastEvaluatedKey" in response:
-            self._exclusive_start_key = response["LastEvaluatedKey"]
-        yield response
+        if self._auto_plan:
+            planned = self.planned()
+            if planned is not self:
+                yield from planned.iter()
+                return
+        if self._checkpoint:
+            self._restore_checkpoint()
+        if self._total_segments:
+            pages = self._iter_parallel()
+        elif self._checkpoint and self._checkpoint.is_done():
+            pages = iter([])
+        else:
+            pages = ((0, response) for response in super().iter())
+        for segment, response in pages:
+            yield response
+            if self._checkpoint:
+                self._checkpoint.record(segment, response.get("LastEvaluatedKey"))
+
+    def _restore_checkpoint(self):
+        self._checkpoint.load(self._total_segments)
+        if self._total_segments:
+            self._segment_start_keys = {
+                segment: self._checkpoint.start_key(segment)
+                for segment in range(self._total_segments)
+            }
+        else:
+            self._exclusive_start_key = self._checkpoint.start_key()
+
+    def _iter_parallel(self):
+        segments = [
+            segment
+            for segment in range(self._total_segments)
+            if not (self._checkpoint and self._checkpoint.is_done(segment))
+        ]
+        # Bounded queues make workers wait for a slow consumer instead of
+        # buffering whole segments in memory
+        if self._group_by_segment:
+            queues = {
+                segment: Queue(maxsize=self.PAGES_PER_WORKER) for segment in segments
+            }
+        else:
+            maxsize = self.PAGES_PER_WORKER * self._max_workers
+            queues = {None: Queue(maxsize=maxsize)}
+        stopped = Event()
+
+        def put(queue, entry):
+            # Give up once the consumer has stopped so the executor can shut down
+            while not stopped.is_set():
+                try:
+                    queue.put(entry, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def worker(segment):
+            queue = queues[segment if self._group_by_segment else None]
+            try:
+                for response in self._iter_segment(segment, stopped):
+                    if not put(queue, (segment, response, None)):
+                        return
+            except Exception as e:
+                put(queue, (segment, None, e))
+            put(queue, (segment, None, None))
+
+        self._reserve(self._max_workers)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            try:
+                [executor.submit(worker, segment) for segment in segments]
+                for queue in queues.values():
+                    remaining = 1 if self._group_by_segment else len(segments)
+                    while remaining:
+                        segment, response, error = queue.get()
+                        if error:
+                            raise error
+                        if response is None:
+                            remaining -= 1
+                        else:
+                            yield segment, response
+            finally:
+                stopped.set()
+
+    def _iter_segment(self, segment: int, stopped: Event):
+        requests = self._build_requests()
+        requests["Segment"] = segment
+        requests["TotalSegments"] = self._total_segments
+        while not stopped.is_set():
+            if self._segment_start_keys.get(segment):
+                requests["ExclusiveStartKey"] = self._segment_start_keys[segment]
+            response = self._call(self._request, **requests)
+            self._segment_start_keys[segment] = response.get("LastEvaluatedKey")
+            yield response
+            if "LastEvaluatedKey" not in response:
+                break
+
+    def count(self, approximate: bool = False, total_segments: int = None):
+        if total_segments and not approximate:
+            return self._clone().parallel(total_segments).count()
+        return super().count(approximate)
+
+    def _count(self):
+        # Counting must neither resume from nor advance a scan checkpoint
+        self._checkpoint = None
+        return super()._count()
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._segment_start_keys = {}
+        return clone
+
+    def _request(self, **requests):
+        return self._table.scan(**requests)
 
 
 class Query(MultiReadBase):
     def __init__(self, table) -> None:
         super().__init__(table)
         self._scan_index_forward = True
+        self._fan_out = None
 
     def key_condition_exp(self, value: ComparisonCondition):
         if self._key_condition_exp:
@@ -148,24 +578,142 @@ class Query(MultiReadBase):
         self._scan_index_forward = False
         return self
 
+    def fan_out(
+        self,
+        partition_key: str,
+        values: list,
+        sort_key: str = None,
+        max_workers: int = None,
+    ):
+        self._fan_out = (partition_key, list(values), sort_key, max_workers)
+        return self
+
     def _create_requests(self):
         requests = super()._create_requests()
         requests["ScanIndexForward"] = self._scan_index_forward
         return requests
 
+    def _partition_chains(self):
+        partition_key, values, _, _ = self._fan_out
+        for value in values:
+            chain = self._clone()
+            chain._fan_out = None
+            chain._key_condition_exp = None
+            chain.partition_key_exp(Key(partition_key).eq(value))
+            if self._key_condition_exp:
+                chain.sort_key_exp(self._key_condition_exp)
+            yield chain
+
+    def _count(self):
+        if not self._fan_out:
+            return super()._count()
+        self._reserve(self._fan_out[3] or len(self._fan_out[1]))
+        with ThreadPoolExecutor(max_workers=self._fan_out[3]) as executor:
+            return sum(executor.map(Query._count, self._partition_chains()))
+
+    def _cache_key(self):
+        return super()._cache_key(), request_shape(self._fan_out)
+
+    def _key_equalities(self):
+        # Fanned out reads span several partitions, so any write invalidates them
+        return {} if self._fan_out else super()._key_equalities()
+
+    def _sort_key_name(self):
+        from .planner import table_schema
+
+        sort_key = self._fan_out[2]
+        if sort_key:
+            return sort_key
+        for path in table_schema(self._table):
+            if path["IndexName"] == self._index_name and path["SortKey"]:
+                return path["SortKey"]
+        raise ValueError("fan_out needs a sort key to merge partitions.")
+
     def iter(self):
-        requests = self._create_requests()
-        response = self._table.query(**ChainsConditionBuilder(requests).boto3_query)
-        if "LastEvaluatedKey" in response:
-            self._exclusive_start_key = response["LastEvaluatedKey"]
-        yield response
+        if not self._fan_out:
+            yield from super().iter()
+            return
+        # Pages are not merged; they are yielded partition by partition
+        for chain in self._partition_chains():
+            yield from chain.iter()
 
+    def iter_items(self):
+        if not self._fan_out:
+            yield from super().iter_items()
+            return
+        if self._max_items is not None and self._max_items <= 0:
+            return
+        sort_key = self._sort_key_name()
+        if self._projection_exps and sort_key not in self._projection_exps:
+            raise ValueError(f"Projection should include the sort key {sort_key}.")
+        self._reserve(self._fan_out[3] or len(self._fan_out[1]))
+        with ThreadPoolExecutor(max_workers=self._fan_out[3]) as executor:
+            # Request every first page up front so partitions are read concurrently
+            pages = [chain.iter() for chain in self._partition_chains()]
+            streams = [
+                self._iter_partition(executor, page, executor.submit(next, page, None))
+                for page in pages
+            ]
+            items = merge(
+                *streams,
+                key=itemgetter(sort_key),
+                reverse=not self._scan_index_forward,
+            )
+            try:
+                for returned, item in enumerate(items, 1):
+                    yield item
+                    if returned == self._max_items:
+                        return
+            finally:
+                [stream.close() for stream in streams]
 
-class PutItem(WriteBase):
-    def __init__(self, table) -> None:
-        super().__init__(table)
-        self._item = {}
+    @staticmethod
+    def _iter_partition(executor, pages, future):
+        try:
+            while True:
+                page = future.result()
+                if page is None:
+                    return
+                future = executor.submit(next, pages, None)
+                yield from page["Items"]
+        finally:
+            future.cancel()
+
+    def _request(self, **requests):
+        return self._table.query(**requests)
+
+
+class Prepared:
+    __slots__ = ("_chain",)
+
+    def __init__(self, chain: MultiReadBase) -> None:
+        chain = chain._clone()
+        # Compile once up front so every later bind hits the cache
+        chain._compile_requests()
+        object.__setattr__(self, "_chain", chain)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Prepared chains are immutable.")
+
+    def bind(self, **values):
+        chain = self._chain._clone()
+        chain._binds = values
+        return chain
+
+    def iter(self, **values):
+        return self.bind(**values).iter()
+
+    def iter_items(self, **values):
+        return self.bind(**values).iter_items()
+
+    def run(self, **values):
+        return self.bind(**values).run()
 
+    def count(self, **values):
+        return self.bind(**values).count()
+
+
+class ItemMixin:
     def item(self, key, value):
         self._item |= {key: value}
         return self
@@ -195,8 +743,401 @@ class PutItem(WriteBase):
         self._item |= item
         return self
 
+
+class PutItem(ItemMixin, WriteBase):
+    def __init__(self, table) -> None:
+        super().__init__(table)
+        self._item = {}
+
     def run(self):
         requests = {"Item": self._item}
         if self._condition_exp:
             requests["ConditionExpression"] = self._condition_exp
-        self._table.put_item(**requests)
+        if self._return_consumed_capacity != "NONE":
+            requests["ReturnConsumedCapacity"] = self._return_consumed_capacity
+        self._call(self._table.put_item, **requests)
+        invalidate_item(self._table.name, self._item)
+
+
+class UpdateItem(ItemMixin, WriteBase):
+    def __init__(self, table) -> None:
+        super().__init__(table)
+        self._item = {}
+        self._sets = {}
+        self._adds = {}
+        self._removes = []
+        self._return_values = None
+
+    @singledispatchmethod
+    def set(self, name: str, value):
+        self._sets[name] = value
+        return self
+
+    @set.register
+    def _(self, values: dict):
+        self._sets |= values
+        return self
+
+    @singledispatchmethod
+    def add(self, name: str, value):
+        # Numbers are added to counters and sets are unioned into set attributes
+        self._adds[name] = value
+        return self
+
+    @add.register
+    def _(self, values: dict):
+        self._adds |= values
+        return self
+
+    def remove(self, *names: str):
+        self._removes.extend(names)
+        return self
+
+    def return_values(self, value: str = "UPDATED_NEW"):
+        self._return_values = value
+        return self
+
+    def _update_expression(self, builder: SharedConditionBuilder, operation: dict):
+        clauses = []
+        for action, values, separator in [
+            ("SET", self._sets, " = "),
+            ("ADD", self._adds, " "),
+        ]:
+            if values:
+                assignments = [
+                    builder.name(operation, k) + separator + builder.value(operation, v)
+                    for k, v in values.items()
+                ]
+                clauses.append(f"{action} " + ", ".join(assignments))
+        if self._removes:
+            names = [builder.name(operation, name) for name in self._removes]
+            clauses.append("REMOVE " + ", ".join(names))
+        if not clauses:
+            raise ValueError("UpdateItem needs at least one SET, ADD or REMOVE.")
+        operation["UpdateExpression"] = " ".join(clauses)
+        return operation
+
+    def run(self):
+        builder = SharedConditionBuilder()
+        requests = self._update_expression(builder, {"Key": self._item})
+        if self._condition_exp:
+            builder.add_condition(requests, self._condition_exp)
+        if self._return_values:
+            requests["ReturnValues"] = self._return_values
+        if self._return_consumed_capacity != "NONE":
+            requests["ReturnConsumedCapacity"] = self._return_consumed_capacity
+        response = self._call(self._table.update_item, **requests)
+        invalidate_item(self._table.name, self._item)
+        return response.get("Attributes")
+
+
+class BatchBase(AccessorBase):
+    CHUNK_SIZE = 25
+
+    def __init__(self, table) -> None:
+        super().__init__(table)
+        self._max_workers = 1
+        self._max_retries = 8
+        # The summaries report the capacity the batch consumed
+        self._return_consumed_capacity = "TOTAL"
+
+    def parallel(self, max_workers: int):
+        self._max_workers = max_workers
+        return self
+
+    def max_retries(self, value: int):
+        self._max_retries = value
+        return self
+
+    def _run_chunks(self, func, values):
+        chunks = [
+            values[i : i + self.CHUNK_SIZE]
+            for i in range(0, len(values), self.CHUNK_SIZE)
+        ]
+        self._reserve(self._max_workers or len(chunks))
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            return list(executor.map(func, chunks))
+
+    def _iter_retry(self, request, request_items, unprocessed_key: str):
+        from .throttle import backoff
+
+        retries = 0
+        while True:
+            response = self._call(
+                request,
+                RequestItems=request_items,
+                ReturnConsumedCapacity=self._return_consumed_capacity,
+            )
+            yield response, retries
+            request_items = response.get(unprocessed_key)
+            if not request_items:
+                return
+            # Batch calls report throttling as unprocessed entries
+            if self._controller:
+                self._controller.congested()
+            if retries >= self._max_retries:
+                raise RuntimeError(
+                    f"{unprocessed_key} were left after {retries} retries."
+                )
+            backoff(retries)
+            retries += 1
+
+
+class BatchWrite(ItemMixin, BatchBase):
+    _capacity_kind = "write"
+
+    def __init__(self, table) -> None:
+        super().__init__(table)
+        self._item = {}
+        self._requests = []
+
+    def put(self, item=None):
+        item = self._pop_item(item)
+        if isinstance(item, PutItem):
+            if item._condition_exp:
+                raise ValueError("BatchWriteItem does not support condition_exp.")
+            item = item._item
+        self._requests.append({"PutRequest": {"Item": item}})
+        return self
+
+    def delete(self, key=None):
+        key = self._pop_item(key)
+        if isinstance(key, ItemMixin):
+            key = key._item
+        self._requests.append({"DeleteRequest": {"Key": key}})
+        return self
+
+    def _pop_item(self, value):
+        # Without an argument, flush the item built by the chain so far
+        if value is None:
+            value, self._item = self._item, {}
+        return value
+
+    def _unique_requests(self):
+        # DynamoDB rejects a batch that repeats a key, so the last request for
+        # each key wins
+        from .planner import table_schema
+
+        path = table_schema(self._table)[0]
+        names = [x for x in (path["PartitionKey"], path["SortKey"]) if x]
+        requests = {}
+        for request in self._requests:
+            if "PutRequest" in request:
+                item = request["PutRequest"]["Item"]
+            else:
+                item = request["DeleteRequest"]["Key"]
+            key_id = tuple(item.get(name) for name in names)
+            requests.pop(key_id, None)
+            requests[key_id] = request
+        return list(requests.values())
+
+    def run(self):
+        requests = self._unique_requests()
+        results = self._run_chunks(self._write_chunk, requests)
+        for request in requests:
+            if "PutRequest" in request:
+                invalidate_item(self._table.name, request["PutRequest"]["Item"])
+            else:
+                invalidate_item(self._table.name, request["DeleteRequest"]["Key"])
+        return {
+            "WrittenCount": sum(result["WrittenCount"] for result in results),
+            "RetryCount": sum(result["RetryCount"] for result in results),
+            "ConsumedCapacityUnits": sum(
+                result["ConsumedCapacityUnits"] for result in results
+            ),
+        }
+
+    def _write_chunk(self, chunk):
+        from .throttle import consumed_capacity_units
+
+        result = {"WrittenCount": 0, "RetryCount": 0, "ConsumedCapacityUnits": 0}
+        responses = self._iter_retry(
+            self._client().batch_write_item,
+            {self._table.name: chunk},
+            "UnprocessedItems",
+        )
+        written = len(chunk)
+        for response, retries in responses:
+            unprocessed = response.get("UnprocessedItems", {})
+            left = sum(map(len, unprocessed.values()))
+            result["WrittenCount"] += written - left
+            result["RetryCount"] = retries
+            result["ConsumedCapacityUnits"] += consumed_capacity_units(response)
+            written = left
+        return result
+
+
+class BatchGet(ItemMixin, BatchBase, ReadBase):
+    CHUNK_SIZE = 100
+
+    def __init__(self, table) -> None:
+        super().__init__(table)
+        self._max_workers = None
+        self._item = {}
+        self._keys = {}
+
+    def key(self, key=None):
+        # Without an argument, flush the key built by the chain so far
+        if key is None:
+            key, self._item = self._item, {}
+        elif isinstance(key, ItemMixin):
+            key = key._item
+        self._keys.setdefault(tuple(sorted(key.items())), key)
+        return self
+
+    def keys(self, values):
+        [self.key(value) for value in values]
+        return self
+
+    def run(self):
+        if self._cache:
+            return self._run_cached()
+        results = self._run_chunks(self._get_chunk, list(self._keys.values()))
+        return [item for items in results for item in items]
+
+    def _run_cached(self):
+        # Each key is cached on its own, so only the keys missing from the
+        # cache are fetched, in one batch
+        shape = tuple(self._projection_exps), self._consistent_read
+        names = sorted(next(iter(self._keys.values()), {}))
+        # The key attributes identify the fetched items, so they are projected
+        # even when not asked for
+        extra = [
+            name
+            for name in names
+            if self._projection_exps and name not in self._projection_exps
+        ]
+
+        def load(missing):
+            batch = copy(self)
+            batch._cache = None
+            batch._keys = {key_id: self._keys[key_id] for _, key_id, _ in missing}
+            batch._projection_exps = self._projection_exps + extra
+            loaded = {}
+            for item in batch.run():
+                key_id = tuple((name, item[name]) for name in names)
+                [item.pop(name) for name in extra]
+                loaded[("BatchGet", key_id, shape)] = item
+            return loaded
+
+        items = self._cache.get_many_or_load(
+            self._table.name,
+            {("BatchGet", key_id, shape): key for key_id, key in self._keys.items()},
+            load,
+        )
+        return [item for item in items.values() if item is not None]
+
+    def _get_chunk(self, chunk):
+        requests = {"Keys": chunk, "ConsistentRead": self._consistent_read}
+        if self._projection_exps:
+            requests["ProjectionExpression"] = ",".join(self._projection_exps)
+        requests = ChainsConditionBuilder(requests).boto3_query
+        responses = self._iter_retry(
+            self._client().batch_get_item,
+            {self._table.name: requests},
+            "UnprocessedKeys",
+        )
+        return [
+            item
+            for response, _ in responses
+            for item in response["Responses"].get(self._table.name, [])
+        ]
+
+
+class TransactWrite(AccessorBase):
+    _capacity_kind = "write"
+    CHUNK_SIZE = 100
+    RETRYABLE_REASONS = {"TransactionConflict"}
+
+    def __init__(self, table) -> None:
+        super().__init__(table)
+        self._operations = []
+        self._max_retries = 8
+
+    def max_retries(self, value: int):
+        self._max_retries = value
+        return self
+
+    def put(self, item, condition_exp: ComparisonCondition = None):
+        if isinstance(item, PutItem):
+            condition_exp = condition_exp or item._condition_exp
+            item = item._item
+        self._operations.append(("Put", {"Item": item}, condition_exp))
+        return self
+
+    def update(self, key, values: dict = None, condition_exp=None):
+        if isinstance(key, UpdateItem):
+            condition_exp = condition_exp or key._condition_exp
+            update = key
+        elif values is None:
+            raise ValueError("values should be given with a key dict.")
+        else:
+            update = UpdateItem(self._table).attr(key).set(values)
+        operation = {"Key": update._item, "Update": update}
+        self._operations.append(("Update", operation, condition_exp))
+        return self
+
+    def delete(self, key: dict, condition_exp: ComparisonCondition = None):
+        self._operations.append(("Delete", {"Key": key}, condition_exp))
+        return self
+
+    def condition_check(self, key: dict, condition_exp: ComparisonCondition):
+        self._operations.append(("ConditionCheck", {"Key": key}, condition_exp))
+        return self
+
+    def _compile(self, operations):
+        builder = SharedConditionBuilder()
+        items = []
+        for kind, operation, condition_exp in operations:
+            operation = {"TableName": self._table.name} | operation
+            if kind == "Update":
+                operation.pop("Update")._update_expression(builder, operation)
+            if condition_exp:
+                builder.add_condition(operation, condition_exp)
+            items.append({kind: operation})
+        return items
+
+    def run(self):
+        from .throttle import backoff, consumed_capacity_units
+
+        result = {"TransactionCount": 0, "RetryCount": 0, "ConsumedCapacityUnits": 0}
+        for i in range(0, len(self._operations), self.CHUNK_SIZE):
+            items = self._compile(self._operations[i : i + self.CHUNK_SIZE])
+            # The same token makes a resubmitted transaction idempotent
+            token = str(uuid4())
+            retries = 0
+            while True:
+                try:
+                    response = self._call(
+                        self._client().transact_write_items,
+                        TransactItems=items,
+                        ClientRequestToken=token,
+                        ReturnConsumedCapacity=self._return_consumed_capacity,
+                    )
+                    break
+                except ClientError as e:
+                    if not self._is_retryable(e) or retries >= self._max_retries:
+                        raise
+                    backoff(retries)
+                    retries += 1
+            result["TransactionCount"] += 1
+            result["RetryCount"] += retries
+            result["ConsumedCapacityUnits"] += consumed_capacity_units(response)
+        for kind, operation, _ in self._operations:
+            if kind in ("Put", "Update", "Delete"):
+                invalidate_item(
+                    self._table.name, operation.get("Key", operation.get("Item"))
+                )
+        return result
+
+    def _is_retryable(self, error: ClientError):
+        code = error.response["Error"]["Code"]
+        if code == "TransactionConflictException":
+            return True
+        if code != "TransactionCanceledException":
+            return False
+        reasons = {
+            reason.get("Code")
+            for reason in error.response.get("CancellationReasons", [])
+        } - {"None", None}
+        return bool(reasons) and reasons <= self.RETRYABLE_REASONS
@@ -0,0 +1,97 @@
+import asyncio
+from concurrent.futures import Future
+from threading import Lock, Thread, Timer
+
+from .dynamochain import BatchGet, ItemMixin
+
+
+def _key_id(key: dict):
+    return tuple(sorted(key.items()))
+
+
+class BatchLoader:
+    def __init__(
+        self,
+        table,
+        window: float = 0.002,
+        max_batch_size: int = BatchGet.CHUNK_SIZE,
+    ) -> None:
+        self._table = table
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._projection_exps = []
+        self._consistent_read = False
+        self._pending = {}
+        self._timer = None
+        self._lock = Lock()
+
+    def projection_exp(self, value: str):
+        self._projection_exps.extend([x.strip() for x in value.split(",")])
+        return self
+
+    def consistent_read(self, value: bool = True):
+        self._consistent_read = value
+        return self
+
+    def submit(self, key) -> Future:
+        if isinstance(key, ItemMixin):
+            key = key._item
+        key_id = _key_id(key)
+        with self._lock:
+            # Callers asking for a key already in flight share its future
+            if key_id in self._pending:
+                return self._pending[key_id][1]
+            future = Future()
+            self._pending[key_id] = (key, future)
+            if len(self._pending) >= self._max_batch_size:
+                batch = self._take()
+            else:
+                batch = None
+                if not self._timer:
+                    self._timer = Timer(self._window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if batch:
+            # Load on a worker so a caller on an event loop does not block
+            Thread(target=self._load, args=(batch,), daemon=True).start()
+        return future
+
+    def load(self, key):
+        return self.submit(key).result()
+
+    def load_many(self, keys):
+        return [future.result() for future in [self.submit(key) for key in keys]]
+
+    async def load_async(self, key):
+        return await asyncio.wrap_future(self.submit(key))
+
+    def flush(self):
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._load(batch)
+
+    def _take(self):
+        batch, self._pending = self._pending, {}
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _load(self, batch: dict):
+        try:
+            names = {name for key, _ in batch.values() for name in key}
+            get = BatchGet(self._table).consistent_read(self._consistent_read)
+            if self._projection_exps:
+                # Key attributes are needed to hand each item to its caller
+                projection = self._projection_exps + sorted(
+                    names - set(self._projection_exps)
+                )
+                get.projection_exp(",".join(projection))
+            items = get.keys(key for key, _ in batch.values()).run()
+        except Exception as e:
+            [future.set_exception(e) for _, future in batch.values()]
+            return
+        found = {_key_id({name: item[name] for name in names}): item for item in items}
+        for key_id, (_, future) in batch.items():
+            future.set_result(found.get(key_id))
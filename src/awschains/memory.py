@@ -0,0 +1,753 @@
+import re
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+from functools import lru_cache
+from math import ceil
+from operator import ge, gt, le, lt
+from zlib import crc32
+
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+from boto3.dynamodb.types import Binary
+from botocore.exceptions import ClientError
+
+from .conditions import parse_projection
+
+PAGE_BYTES = 1024 * 1024
+
+_MISSING = object()
+_TOKENS = re.compile(
+    r"\s*(?:(?P<cmp><>|<=|>=|=|<|>)|(?P<name>#\w+)|(?P<value>:\w+)"
+    r"|(?P<index>\[\d+\])|(?P<word>[A-Za-z_]\w*)|(?P<punct>[(),.+-]))"
+)
+_ORDERS = {"<": lt, "<=": le, ">": gt, ">=": ge}
+_FUNCTIONS = {
+    "attribute_exists",
+    "attribute_not_exists",
+    "attribute_type",
+    "begins_with",
+    "contains",
+}
+_UPDATE_ACTIONS = {"SET", "REMOVE", "ADD", "DELETE"}
+
+
+def _error(code: str, message: str, operation: str):
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation)
+
+
+def _kind(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, (int, float, Decimal)):
+        return "N"
+    if isinstance(value, str):
+        return "S"
+    if isinstance(value, (bytes, bytearray, Binary)):
+        return "B"
+    if isinstance(value, dict):
+        return "M"
+    if isinstance(value, (list, tuple)):
+        return "L"
+    if isinstance(value, (set, frozenset)):
+        kinds = {_kind(v) for v in value}
+        return kinds.pop() + "S" if len(kinds) == 1 else "SS"
+    raise TypeError(f"Unsupported type {type(value).__name__}.")
+
+
+def attribute_size(value):
+    # Close to how DynamoDB sizes items, which is what its 1 MB page limit counts
+    if isinstance(value, str):
+        return len(value.encode())
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float, Decimal)):
+        return len(str(value).lstrip("-").replace(".", "")) // 2 + 1
+    if isinstance(value, Binary):
+        return len(value.value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return 3 + sum(
+            len(k.encode()) + attribute_size(v) + 1 for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return 3 + sum(attribute_size(v) + 1 for v in value)
+    return sum(attribute_size(v) for v in value)
+
+
+def item_size(item: dict):
+    return sum(len(k.encode()) + attribute_size(v) for k, v in item.items())
+
+
+def _copy(value):
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+class _Parser:
+    def __init__(self, expression: str):
+        self._tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKENS.match(expression, position)
+            if not match or match.end() == position:
+                raise ValueError(f"Invalid expression: {expression!r}")
+            self._tokens.append((match.lastgroup, match[match.lastgroup]))
+            position = match.end()
+        self._position = 0
+
+    def peek(self, offset: int = 0):
+        position = self._position + offset
+        return self._tokens[position] if position < len(self._tokens) else (None, None)
+
+    def next(self):
+        token = self.peek()
+        self._position += 1
+        return token
+
+    def keyword(self, *words: str):
+        kind, value = self.peek()
+        if kind == "word" and value.upper() in words:
+            self._position += 1
+            return value.upper()
+        return None
+
+    def expect(self, value: str):
+        if self.next()[1] != value:
+            raise ValueError(f"Expected {value!r} in expression.")
+
+    def done(self):
+        if self._position < len(self._tokens):
+            raise ValueError(f"Unexpected {self.peek()[1]!r} in expression.")
+
+    def condition(self):
+        node = self._and()
+        while self.keyword("OR"):
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self.keyword("AND"):
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self):
+        if self.keyword("NOT"):
+            return ("not", self._not())
+        return self._predicate()
+
+    def _predicate(self):
+        kind, value = self.peek()
+        if value == "(":
+            self.next()
+            node = self.condition()
+            self.expect(")")
+            return node
+        if kind == "word" and value in _FUNCTIONS and self.peek(1)[1] == "(":
+            self.next()
+            return ("function", value, self._arguments())
+        left = self.operand()
+        if self.peek()[0] == "cmp":
+            return ("compare", self.next()[1], left, self.operand())
+        if self.keyword("BETWEEN"):
+            low = self.operand()
+            if not self.keyword("AND"):
+                raise ValueError("Expected AND in BETWEEN.")
+            return ("between", left, low, self.operand())
+        if self.keyword("IN"):
+            return ("in", left, self._arguments())
+        raise ValueError(f"Unexpected {self.peek()[1]!r} in expression.")
+
+    def _arguments(self):
+        self.expect("(")
+        arguments = [self.operand()]
+        while self.peek()[1] == ",":
+            self.next()
+            arguments.append(self.operand())
+        self.expect(")")
+        return tuple(arguments)
+
+    def operand(self):
+        kind, value = self.peek()
+        if kind == "value":
+            self.next()
+            return ("value", value)
+        if kind == "word" and self.peek(1)[1] == "(":
+            self.next()
+            return ("call", value, self._arguments())
+        return self.path()
+
+    def path(self):
+        kind, value = self.next()
+        if kind not in ("name", "word"):
+            raise ValueError(f"Expected an attribute name, got {value!r}.")
+        elements = [value]
+        while True:
+            kind, value = self.peek()
+            if kind == "index":
+                elements.append(int(value[1:-1]))
+            elif value == "." and self.peek(1)[0] in ("name", "word"):
+                self.next()
+                elements.append(self.peek()[1])
+            else:
+                return ("path", tuple(elements))
+            self.next()
+
+    def update(self):
+        actions = []
+        action = self.keyword(*_UPDATE_ACTIONS)
+        if not action:
+            raise ValueError("Update expression should start with an action.")
+        while action:
+            while True:
+                actions.append(self._update_action(action))
+                if self.peek()[1] != ",":
+                    break
+                self.next()
+            action = self.keyword(*_UPDATE_ACTIONS)
+        return tuple(actions)
+
+    def _update_action(self, action: str):
+        path = self.path()
+        if action == "REMOVE":
+            return (action, path, None)
+        if action != "SET":
+            return (action, path, self.operand())
+        self.expect("=")
+        value = self.operand()
+        if self.peek()[1] in ("+", "-"):
+            value = ("arithmetic", self.next()[1], value, self.operand())
+        return (action, path, value)
+
+
+@lru_cache(maxsize=1024)
+def parse_condition(expression: str):
+    parser = _Parser(expression)
+    node = parser.condition()
+    parser.done()
+    return node
+
+
+@lru_cache(maxsize=1024)
+def parse_update(expression: str):
+    parser = _Parser(expression)
+    actions = parser.update()
+    parser.done()
+    return actions
+
+
+class _Context:
+    """Placeholders of one request, used to evaluate its expressions"""
+
+    def __init__(self, requests: dict):
+        self.names = requests.get("ExpressionAttributeNames", {})
+        self.values = requests.get("ExpressionAttributeValues", {})
+
+    def elements(self, path: tuple):
+        return tuple(
+            self.names[e] if type(e) is str and e.startswith("#") else e for e in path
+        )
+
+    def resolve(self, item, path: tuple):
+        value = item
+        for element in self.elements(path):
+            try:
+                value = value[element]
+            except (KeyError, IndexError, TypeError):
+                return _MISSING
+        return value
+
+    def operand(self, node, item):
+        if node[0] == "value":
+            return self.values[node[1]]
+        if node[0] == "path":
+            return self.resolve(item, node[1])
+        if node[0] == "arithmetic":
+            left, right = self.operand(node[2], item), self.operand(node[3], item)
+            return left + right if node[1] == "+" else left - right
+        name, arguments = node[1], node[2]
+        values = [self.operand(argument, item) for argument in arguments]
+        if name == "size":
+            return _MISSING if values[0] is _MISSING else _size_of(values[0])
+        if name == "if_not_exists":
+            return values[1] if values[0] is _MISSING else values[0]
+        if name == "list_append":
+            return list(values[0]) + list(values[1])
+        raise ValueError(f"Unknown function {name}.")
+
+    def evaluate(self, node, item):
+        kind = node[0]
+        if kind == "and":
+            return self.evaluate(node[1], item) and self.evaluate(node[2], item)
+        if kind == "or":
+            return self.evaluate(node[1], item) or self.evaluate(node[2], item)
+        if kind == "not":
+            return not self.evaluate(node[1], item)
+        if kind == "compare":
+            left, right = self.operand(node[2], item), self.operand(node[3], item)
+            return _compare(node[1], left, right)
+        if kind == "between":
+            value, low, high = [self.operand(x, item) for x in node[1:]]
+            return _compare(">=", value, low) and _compare("<=", value, high)
+        if kind == "in":
+            value = self.operand(node[1], item)
+            return any(_compare("=", value, self.operand(x, item)) for x in node[2])
+        return self._function(node[1], node[2], item)
+
+    def _function(self, name: str, arguments: tuple, item):
+        value = self.operand(arguments[0], item)
+        if name == "attribute_exists":
+            return value is not _MISSING
+        if name == "attribute_not_exists":
+            return value is _MISSING
+        operand = self.operand(arguments[1], item)
+        if value is _MISSING:
+            return False
+        if name == "attribute_type":
+            return _kind(value) == operand
+        if name == "begins_with":
+            if _kind(value) != _kind(operand) or _kind(value) not in ("S", "B"):
+                return False
+            return _raw(value).startswith(_raw(operand))
+        if _kind(value) == "S":
+            return _kind(operand) == "S" and operand in value
+        if _kind(value) in ("L", "SS", "NS", "BS"):
+            return any(_compare("=", v, operand) for v in value)
+        return False
+
+
+def _size_of(value):
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, Binary):
+        return len(value.value)
+    return len(value)
+
+
+def _raw(value):
+    return value.value if isinstance(value, Binary) else value
+
+
+def _compare(operator: str, left, right):
+    if left is _MISSING or right is _MISSING:
+        return False
+    same = _kind(left) == _kind(right)
+    if operator == "=":
+        return same and _raw(left) == _raw(right)
+    if operator == "<>":
+        return not (same and _raw(left) == _raw(right))
+    if not same or _kind(left) not in ("N", "S", "B"):
+        return False
+    return _ORDERS[operator](_raw(left), _raw(right))
+
+
+def _prefix_end(prefix):
+    # Smallest value greater than every value starting with the prefix
+    if isinstance(prefix, str):
+        return prefix[:-1] + chr(ord(prefix[-1]) + 1) if prefix else None
+    prefix = bytes(prefix).rstrip(b"\xff")
+    return prefix[:-1] + bytes([prefix[-1] + 1]) if prefix else None
+
+
+class _Slots(dict):
+    """List elements picked by a projection, keyed by their index"""
+
+
+def _unslot(value):
+    if isinstance(value, _Slots):
+        return [_unslot(value[index]) for index in sorted(value)]
+    if isinstance(value, dict):
+        return {k: _unslot(v) for k, v in value.items()}
+    return value
+
+
+class _Partition:
+    __slots__ = ("keys", "items")
+
+    def __init__(self):
+        self.keys = []
+        self.items = {}
+
+
+class MemoryTable:
+    """In-process table that answers the requests the chains send.
+
+    Partitions keep their sort keys in a sorted list, so key conditions on the
+    sort key are bisected instead of filtered. Expressions are evaluated from
+    their compiled form with placeholders, and pages stop at Limit or 1 MB of
+    read items like DynamoDB does.
+    """
+
+    def __init__(self, table_name: str, partition_key: str, sort_key: str = None):
+        self.name = table_name
+        self._partition_key = partition_key
+        self._sort_key = sort_key
+        self._partitions = {}
+        self._partition_values = []
+        self._count = 0
+        self._bytes = 0
+
+    @property
+    def key_schema(self):
+        schema = [{"AttributeName": self._partition_key, "KeyType": "HASH"}]
+        if self._sort_key:
+            schema.append({"AttributeName": self._sort_key, "KeyType": "RANGE"})
+        return schema
+
+    @property
+    def client(self):
+        # Lets DescribeTable callers such as the planner treat this as a client
+        return self
+
+    def describe_table(self, TableName: str = None):
+        return {
+            "Table": {
+                "TableName": self.name,
+                "KeySchema": self.key_schema,
+                "ItemCount": self._count,
+                "TableSizeBytes": self._bytes,
+            }
+        }
+
+    def get_item(self, Key: dict, **requests):
+        requests = self._compile(requests)
+        stored = self._get(self._key(Key, "GetItem"))
+        response = {}
+        if stored:
+            response["Item"] = self._read(stored[0], requests)
+        return self._consumed(response, requests, stored[1] if stored else 0, 4096)
+
+    def put_item(self, Item: dict, **requests):
+        requests = self._compile(requests)
+        key = self._key(Item, "PutItem")
+        old = self._check(key, requests, "PutItem")
+        self._store(key, _copy(Item))
+        return self._written(old, Item, requests)
+
+    def delete_item(self, Key: dict, **requests):
+        requests = self._compile(requests)
+        key = self._key(Key, "DeleteItem")
+        old = self._check(key, requests, "DeleteItem")
+        if old is not None:
+            self._remove(key)
+        return self._written(old, old or {}, requests)
+
+    def update_item(self, Key: dict, UpdateExpression: str, **requests):
+        requests = self._compile(requests)
+        key = self._key(Key, "UpdateItem")
+        old = self._check(key, requests, "UpdateItem")
+        item = _copy(old) if old is not None else dict(zip(self._key_names(), key))
+        context = _Context(requests)
+        updated = set()
+        for action, path, operand in parse_update(UpdateExpression):
+            elements = context.elements(path[1])
+            updated.add(elements[0])
+            value = None if operand is None else context.operand(operand, old or {})
+            self._apply(item, action, elements, value)
+        self._store(key, item)
+        response = self._written(None, item, requests)
+        returns = requests.get("ReturnValues", "NONE")
+        source = old if returns.endswith("OLD") else item
+        if returns != "NONE" and source is not None:
+            if returns.startswith("UPDATED"):
+                source = {k: v for k, v in source.items() if k in updated}
+            response["Attributes"] = _copy(source)
+        return response
+
+    def query(self, **requests):
+        requests = self._compile(requests)
+        self._reject_index(requests, "Query")
+        context = _Context(requests)
+        partition, low, high = self._key_range(
+            parse_condition(requests["KeyConditionExpression"]), context
+        )
+        if partition is None:
+            return self._page(iter([]), requests, context)
+        forward = requests.get("ScanIndexForward", True)
+        start = requests.get("ExclusiveStartKey")
+        if start and forward:
+            low = max(low, bisect_right(partition.keys, self._sort_of(start)))
+        elif start:
+            high = min(high, bisect_left(partition.keys, self._sort_of(start)))
+        keys = partition.keys[low:high]
+        candidates = (
+            partition.items[sort] for sort in (keys if forward else reversed(keys))
+        )
+        return self._page(candidates, requests, context)
+
+    def scan(self, Segment: int = 0, TotalSegments: int = 1, **requests):
+        requests = self._compile(requests)
+        self._reject_index(requests, "Scan")
+        return self._page(
+            self._iter_scan(requests.get("ExclusiveStartKey"), Segment, TotalSegments),
+            requests,
+            _Context(requests),
+        )
+
+    def _iter_scan(self, start: dict, segment: int, total_segments: int):
+        index = 0
+        if start:
+            value = start[self._partition_key]
+            index = bisect_left(self._partition_values, value)
+            partition = self._partitions.get(value)
+            if partition is not None:
+                keys = partition.keys
+                for sort in keys[bisect_right(keys, self._sort_of(start)) :]:
+                    yield partition.items[sort]
+                index += 1
+        for value in self._partition_values[index:]:
+            # Whole partitions belong to one segment, as they do in DynamoDB
+            if total_segments > 1 and self._segment(value, total_segments) != segment:
+                continue
+            partition = self._partitions[value]
+            for sort in list(partition.keys):
+                yield partition.items[sort]
+
+    @staticmethod
+    def _segment(value, total_segments: int):
+        return crc32(repr(value).encode()) % total_segments
+
+    def _page(self, candidates, requests: dict, context: _Context):
+        limit = requests.get("Limit")
+        filter_exp = requests.get("FilterExpression")
+        condition = parse_condition(filter_exp) if filter_exp else None
+        count_only = requests.get("Select") == "COUNT"
+        items = []
+        scanned = 0
+        read = 0
+        last = None
+        for item, size in candidates:
+            if last is not None and (scanned == limit or read >= PAGE_BYTES):
+                break
+            scanned += 1
+            read += size
+            last = item
+            if condition and not context.evaluate(condition, item):
+                continue
+            items.append(None if count_only else self._read(item, requests))
+        else:
+            last = None
+        response = {"Count": len(items), "ScannedCount": scanned}
+        if not count_only:
+            response["Items"] = items
+        if last is not None:
+            response["LastEvaluatedKey"] = {
+                name: last[name] for name in self._key_names()
+            }
+        return self._consumed(response, requests, read, 4096)
+
+    def _read(self, item: dict, requests: dict):
+        projection = requests.get("ProjectionExpression")
+        if not projection:
+            return _copy(item)
+        context = _Context(requests)
+        projected = {}
+        for path in parse_projection(projection):
+            elements = context.elements(path)
+            value = context.resolve(item, elements)
+            if value is _MISSING:
+                continue
+            target = projected
+            for element, following in zip(elements, elements[1:]):
+                target = target.setdefault(
+                    element, _Slots() if type(following) is int else {}
+                )
+            target[elements[-1]] = _copy(value)
+        return _unslot(projected)
+
+    def _key_range(self, condition, context: _Context):
+        conditions = [condition]
+        partition = sort = None
+        while conditions:
+            node = conditions.pop()
+            if node[0] == "and":
+                conditions.extend(node[1:])
+                continue
+            operands = {"compare": node[2:], "between": node[1:], "function": node[2]}
+            names = [
+                context.elements(x[1])
+                for x in operands.get(node[0], ())
+                if x[0] == "path"
+            ]
+            if names == [(self._partition_key,)] and node[:2] == ("compare", "="):
+                partition = context.operand(node[3], None)
+            elif names == [(self._sort_key,)]:
+                sort = node
+            else:
+                raise ValueError("Key condition should only use the table keys.")
+        if partition is None:
+            raise ValueError("Key condition should pin the partition key.")
+        partition = self._partitions.get(partition)
+        if partition is None:
+            return None, 0, 0
+        keys = partition.keys
+        if sort is None:
+            return partition, 0, len(keys)
+        if sort[0] == "between":
+            low, high = [context.operand(x, None) for x in sort[2:]]
+            return partition, bisect_left(keys, low), bisect_right(keys, high)
+        if sort[0] == "function":
+            prefix = context.operand(sort[2][1], None)
+            end = _prefix_end(prefix)
+            high = len(keys) if end is None else bisect_left(keys, end)
+            return partition, bisect_left(keys, prefix), high
+        value = context.operand(sort[3], None)
+        return (
+            partition,
+            *{
+                "=": (bisect_left(keys, value), bisect_right(keys, value)),
+                "<": (0, bisect_left(keys, value)),
+                "<=": (0, bisect_right(keys, value)),
+                ">": (bisect_right(keys, value), len(keys)),
+                ">=": (bisect_left(keys, value), len(keys)),
+            }[sort[1]],
+        )
+
+    def _sort_of(self, key: dict):
+        # Tables without a sort key keep one item per partition under 0
+        return key[self._sort_key] if self._sort_key else 0
+
+    def _key_names(self):
+        return [self._partition_key] + ([self._sort_key] if self._sort_key else [])
+
+    def _key(self, item: dict, operation: str):
+        try:
+            return item[self._partition_key], self._sort_of(item)
+        except KeyError:
+            raise _error(
+                "ValidationException",
+                "The provided key element does not match the schema",
+                operation,
+            )
+
+    def _get(self, key: tuple):
+        partition = self._partitions.get(key[0])
+        if partition is None:
+            return None
+        return partition.items.get(key[1])
+
+    def _store(self, key: tuple, item: dict):
+        partition = self._partitions.get(key[0])
+        if partition is None:
+            partition = self._partitions[key[0]] = _Partition()
+            insort(self._partition_values, key[0])
+        sort = key[1]
+        size = item_size(item)
+        if sort in partition.items:
+            self._bytes -= partition.items[sort][1]
+        else:
+            insort(partition.keys, sort)
+            self._count += 1
+        partition.items[sort] = (item, size)
+        self._bytes += size
+
+    def _remove(self, key: tuple):
+        partition = self._partitions[key[0]]
+        sort = key[1]
+        self._bytes -= partition.items.pop(sort)[1]
+        self._count -= 1
+        del partition.keys[bisect_left(partition.keys, sort)]
+        if not partition.keys:
+            del self._partitions[key[0]]
+            del self._partition_values[bisect_left(self._partition_values, key[0])]
+
+    def _check(self, key: tuple, requests: dict, operation: str):
+        stored = self._get(key)
+        old = stored[0] if stored else None
+        condition_exp = requests.get("ConditionExpression")
+        if condition_exp and not _Context(requests).evaluate(
+            parse_condition(condition_exp), old or {}
+        ):
+            raise _error(
+                "ConditionalCheckFailedException",
+                "The conditional request failed",
+                operation,
+            )
+        return old
+
+    @staticmethod
+    def _apply(item: dict, action: str, elements: tuple, value):
+        *parents, name = elements
+        target = item
+        for element in parents:
+            target = target[element]
+        if action == "SET":
+            target[name] = _copy(value)
+        elif action == "REMOVE":
+            try:
+                del target[name]
+            except (KeyError, IndexError):
+                pass
+        elif action == "ADD":
+            current = target[name] if name in target else None
+            if current is None:
+                target[name] = _copy(value)
+            elif _kind(current) == _kind(value) == "N":
+                target[name] = current + value
+            elif _kind(current) == _kind(value) and isinstance(current, set):
+                target[name] = current | value
+            else:
+                raise _error(
+                    "ValidationException",
+                    "An operand in the update expression has an incorrect data type",
+                    "UpdateItem",
+                )
+        elif name in target:
+            target[name] = target[name] - value
+            if not target[name]:
+                del target[name]
+
+    def _written(self, old, item: dict, requests: dict):
+        response = {}
+        if requests.get("ReturnValues") == "ALL_OLD" and old is not None:
+            response["Attributes"] = _copy(old)
+        return self._consumed(response, requests, item_size(item), 1024)
+
+    def _consumed(self, response: dict, requests: dict, size: int, unit: int):
+        if requests.get("ReturnConsumedCapacity", "NONE") == "NONE":
+            return response
+        units = max(1, ceil(size / unit))
+        if unit == 4096 and not requests.get("ConsistentRead"):
+            units /= 2
+        response["ConsumedCapacity"] = {"TableName": self.name, "CapacityUnits": units}
+        return response
+
+    @staticmethod
+    def _reject_index(requests: dict, operation: str):
+        if requests.get("IndexName"):
+            raise _error(
+                "ValidationException",
+                "MemoryTable does not support secondary indexes",
+                operation,
+            )
+
+    @staticmethod
+    def _compile(requests: dict):
+        # Condition objects are accepted like the boto3 resource does
+        builder = ConditionExpressionBuilder()
+        for key in [
+            "KeyConditionExpression",
+            "FilterExpression",
+            "ConditionExpression",
+        ]:
+            if isinstance(requests.get(key), ConditionBase):
+                expression = builder.build_expression(
+                    requests[key], is_key_condition=key == "KeyConditionExpression"
+                )
+                requests = requests | {key: expression.condition_expression}
+                for kind, placeholders in [
+                    ("Names", expression.attribute_name_placeholders),
+                    ("Values", expression.attribute_value_placeholders),
+                ]:
+                    requests[f"ExpressionAttribute{kind}"] = (
+                        requests.get(f"ExpressionAttribute{kind}", {}) | placeholders
+                    )
+        return requests
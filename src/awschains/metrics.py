@@ -0,0 +1,74 @@
+from collections import defaultdict, deque
+from math import ceil
+from threading import Lock
+
+_observers = []
+
+
+def add_observer(observer):
+    _observers.append(observer)
+
+
+def remove_observer(observer):
+    _observers.remove(observer)
+
+
+def global_observers():
+    return _observers
+
+
+def response_bytes(response: dict):
+    headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    return int(headers.get("content-length", 0))
+
+
+def percentile(values: list, rate: float):
+    # Nearest-rank percentile over already sorted values
+    if not values:
+        return None
+    return values[max(0, min(len(values), ceil(rate * len(values))) - 1)]
+
+
+class MetricsCollector:
+    def __init__(self, max_samples: int = 10000):
+        # Percentiles follow the most recent calls once max_samples is reached
+        self._samples = defaultdict(lambda: deque(maxlen=max_samples))
+        self._totals = defaultdict(lambda: defaultdict(float))
+        self._lock = Lock()
+
+    def __call__(self, event: dict):
+        with self._lock:
+            self._samples[event["Operation"]].append(event["WallTime"])
+            totals = self._totals[event["Operation"]]
+            totals["Requests"] += 1
+            for key in [
+                "BuildTime",
+                "Count",
+                "ScannedCount",
+                "Bytes",
+                "ConsumedCapacityUnits",
+                "RetryCount",
+            ]:
+                totals[key] += event.get(key) or 0
+
+    def summary(self):
+        with self._lock:
+            summary = {}
+            for operation, totals in self._totals.items():
+                samples = sorted(self._samples[operation])
+                summary[operation] = dict(totals) | {
+                    "P50": percentile(samples, 0.5),
+                    "P90": percentile(samples, 0.9),
+                    "P99": percentile(samples, 0.99),
+                    "ScannedRatio": (
+                        totals["ScannedCount"] / totals["Count"]
+                        if totals["Count"]
+                        else None
+                    ),
+                }
+            return summary
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
@@ -0,0 +1,227 @@
+from threading import Lock
+
+from boto3.dynamodb.conditions import (
+    And,
+    AttributeBase,
+    AttributeExists,
+    BeginsWith,
+    Between,
+    ConditionBase,
+    Equals,
+    GreaterThan,
+    GreaterThanEquals,
+    Key,
+    LessThan,
+    LessThanEquals,
+)
+
+_KEY_CONDITIONS = {
+    Equals: "eq",
+    LessThan: "lt",
+    LessThanEquals: "lte",
+    GreaterThan: "gt",
+    GreaterThanEquals: "gte",
+    Between: "between",
+    BeginsWith: "begins_with",
+}
+
+_schemas = {}
+_schemas_lock = Lock()
+
+
+def clear_schema_cache():
+    with _schemas_lock:
+        _schemas.clear()
+
+
+def _keys(key_schema: list):
+    keys = {key["KeyType"]: key["AttributeName"] for key in key_schema}
+    return keys["HASH"], keys.get("RANGE")
+
+
+def _access_path(description: dict, index_name: str = None, kind: str = "table"):
+    partition_key, sort_key = _keys(description["KeySchema"])
+    projection = description.get("Projection", {"ProjectionType": "ALL"})
+    return {
+        "IndexName": index_name,
+        "Kind": kind,
+        "PartitionKey": partition_key,
+        "SortKey": sort_key,
+        "ProjectionType": projection["ProjectionType"],
+        "NonKeyAttributes": projection.get("NonKeyAttributes", []),
+    }
+
+
+def _describe(table):
+    client = table.meta.client if hasattr(table, "meta") else table.client
+    return client.describe_table(TableName=table.name)["Table"]
+
+
+def table_schema(table):
+    # DescribeTable runs once per table name; the schema rarely changes
+    with _schemas_lock:
+        if table.name in _schemas:
+            return _schemas[table.name]
+    description = _describe(table)
+    paths = [_access_path(description)]
+    table_keys = {paths[0]["PartitionKey"], paths[0]["SortKey"]} - {None}
+    for kind, key in [
+        ("lsi", "LocalSecondaryIndexes"),
+        ("gsi", "GlobalSecondaryIndexes"),
+    ]:
+        for index in description.get(key, []):
+            path = _access_path(index, index["IndexName"], kind)
+            path["TableKeys"] = table_keys
+            paths.append(path)
+    with _schemas_lock:
+        _schemas[table.name] = paths
+    return paths
+
+
+def item_count(table, index_name: str = None):
+    # ItemCount is refreshed by DynamoDB about every six hours, so it is not cached
+    description = _describe(table)
+    if not index_name:
+        return description["ItemCount"]
+    for key in ["LocalSecondaryIndexes", "GlobalSecondaryIndexes"]:
+        for index in description.get(key, []):
+            if index["IndexName"] == index_name:
+                return index["ItemCount"]
+    raise ValueError(f"Index {index_name} is not defined on {table.name}.")
+
+
+def conjuncts(condition):
+    if not condition:
+        return []
+    if isinstance(condition, And):
+        left, right = condition.get_expression()["values"]
+        return conjuncts(left) + conjuncts(right)
+    return [condition]
+
+
+def _attribute(condition):
+    # Only comparisons of an attribute against values can become key conditions
+    if type(condition) not in _KEY_CONDITIONS:
+        return None
+    attribute, *values = condition.get_expression()["values"]
+    if any(isinstance(value, AttributeBase) for value in values):
+        return None
+    return attribute.name
+
+
+def _names(condition):
+    names = set()
+    for value in condition.get_expression()["values"]:
+        if isinstance(value, AttributeBase):
+            names.add(value.name)
+        elif isinstance(value, ConditionBase):
+            names |= _names(value)
+    return names
+
+
+def _covers(path: dict, names: list):
+    if path["ProjectionType"] == "ALL":
+        return True
+    covered = {path["PartitionKey"], path["SortKey"]} | path.get("TableKeys", set())
+    if path["ProjectionType"] == "INCLUDE":
+        covered |= set(path["NonKeyAttributes"])
+    return names is not None and set(names) <= covered
+
+
+class Plan:
+    def __init__(self, path: dict = None, partition=None, sort=None, residual=()):
+        self.path = path
+        self.partition = partition
+        self.sort = sort
+        self.residual = list(residual)
+
+    @property
+    def operation(self):
+        return "Query" if self.path else "Scan"
+
+    def explain(self):
+        if not self.path:
+            return {"Operation": "Scan", "Reason": "No filter pins a partition key."}
+        return {
+            "Operation": "Query",
+            "IndexName": self.path["IndexName"],
+            "PartitionKey": self.path["PartitionKey"],
+            "SortKey": self.path["SortKey"] if self.sort is not None else None,
+            "FilterConditions": len(self.residual),
+        }
+
+
+def _requires(condition, name: str):
+    if type(condition) is not AttributeExists:
+        return False
+    return condition.get_expression()["values"][0].name == name
+
+
+def plan_scan(
+    table,
+    filter_exp,
+    projection: list,
+    consistent_read: bool,
+    index_name: str = None,
+):
+    conditions = conjuncts(filter_exp)
+    names = None
+    if projection:
+        names = [path.split(".")[0].split("[")[0] for path in projection]
+        names += [name for c in conditions for name in _names(c)]
+    candidates = []
+    for path in table_schema(table):
+        if index_name and path["IndexName"] != index_name:
+            continue
+        if path["Kind"] == "gsi" and consistent_read:
+            continue
+        if not _covers(path, names):
+            continue
+        partition = next(
+            (
+                c
+                for c in conditions
+                if type(c) is Equals and _attribute(c) == path["PartitionKey"]
+            ),
+            None,
+        )
+        if partition is None:
+            continue
+        sort = next(
+            (
+                c
+                for c in conditions
+                if path["SortKey"]
+                and c is not partition
+                and _attribute(c) == path["SortKey"]
+            ),
+            None,
+        )
+        required = [c for c in conditions if _requires(c, path["SortKey"])]
+        # Indexes only hold items that have their sort key, so the filter has to
+        # demand it or the Query would silently drop items the Scan returns
+        if path["Kind"] != "table" and path["SortKey"]:
+            if sort is None and not required:
+                continue
+        else:
+            required = []
+        residual = [
+            c
+            for c in conditions
+            if c is not partition and c is not sort and c not in required
+        ]
+        keys = {path["PartitionKey"], path["SortKey"]}
+        # Query filters must not touch the key attributes being queried
+        if any(_names(c) & keys for c in residual):
+            continue
+        score = (sort is not None, path["Kind"] == "table", path["Kind"] == "lsi")
+        candidates.append((score, Plan(path, partition, sort, residual)))
+    if not candidates:
+        return Plan()
+    return max(candidates, key=lambda candidate: candidate[0])[1]
+
+
+def key_condition(condition):
+    expression = condition.get_expression()
+    attribute, *values = expression["values"]
+    return getattr(Key(attribute.name), _KEY_CONDITIONS[type(condition)])(*values)
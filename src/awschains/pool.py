@@ -0,0 +1,175 @@
+import threading
+from functools import partial
+from threading import Lock
+
+import boto3
+from botocore.config import Config
+
+_pools = {}
+_pools_lock = Lock()
+
+
+class ClientPool:
+    """One pooled DynamoDB client shared by every thread.
+
+    The client is thread-safe, but resources are not, so each thread gets its
+    own Table objects wired to the shared client. The connection pool grows
+    when a parallel chain reserves more workers than it can hold, so threads
+    never wait on, or re-handshake for, a connection. The client it replaces
+    is closed once its in-flight calls finish.
+    """
+
+    def __init__(
+        self,
+        region_name: str = None,
+        endpoint_url: str = None,
+        max_pool_connections: int = 10,
+        max_attempts: int = 3,
+        tcp_keepalive: bool = True,
+        session: boto3.session.Session = None,
+    ) -> None:
+        self._region_name = region_name
+        self._endpoint_url = endpoint_url
+        self._max_pool_connections = max_pool_connections
+        self._max_attempts = max_attempts
+        self._tcp_keepalive = tcp_keepalive
+        self._session = session or boto3.session.Session()
+        self._workers = 1
+        self._client = None
+        self._calls = {}
+        self._resource = None
+        self._generation = 0
+        self._local = threading.local()
+        self._lock = Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if not self._client:
+                self._client = self._create_client()
+                self._generation += 1
+            return self._client
+
+    def _create_client(self):
+        client = self._session.client(
+            "dynamodb",
+            region_name=self._region_name,
+            endpoint_url=self._endpoint_url,
+            config=self._config(),
+        )
+        # Count in-flight calls so a replaced client is closed once they finish
+        events = client.meta.events
+        events.register("before-call.dynamodb", partial(self._begin_call, client))
+        events.register("after-call.dynamodb", partial(self._end_call, client))
+        events.register("after-call-error.dynamodb", partial(self._end_call, client))
+        self._calls[client] = 0
+        return client
+
+    def _begin_call(self, client, **kwargs):
+        with self._lock:
+            self._calls[client] = self._calls.get(client, 0) + 1
+
+    def _end_call(self, client, **kwargs):
+        with self._lock:
+            self._calls[client] -= 1
+        self._close_retired(client)
+
+    def _close_retired(self, client):
+        with self._lock:
+            if client is self._client or self._calls.get(client):
+                return
+            self._calls.pop(client, None)
+        client.close()
+
+    def reserve(self, workers: int):
+        # Rebuild the client only when the pool is too small or the retry mode
+        # changes; in-flight calls finish on the old one
+        with self._lock:
+            if workers <= self._workers:
+                return self
+            grow = workers + 1 > self._max_pool_connections or self._workers == 1
+            self._workers = workers
+            retired = self._client if grow else None
+            if grow:
+                self._client = None
+        if retired:
+            self._close_retired(retired)
+        return self
+
+    def table(self, table_name: str):
+        return PooledTable(self, table_name)
+
+    def _config(self):
+        # One extra connection covers the calling thread next to its workers
+        self._max_pool_connections = max(self._max_pool_connections, self._workers + 1)
+        return Config(
+            max_pool_connections=self._max_pool_connections,
+            tcp_keepalive=self._tcp_keepalive,
+            retries={
+                "max_attempts": self._max_attempts,
+                # Adaptive mode rate-limits every thread sharing the client
+                "mode": "adaptive" if self._workers > 1 else "standard",
+            },
+        )
+
+    def _local_table(self, table_name: str):
+        client = self.client
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            with self._lock:
+                # session.resource() builds a client of its own, so it runs
+                # once and every thread copies the resource onto the pooled one
+                if not self._resource:
+                    self._resource = self._session.resource(
+                        "dynamodb",
+                        region_name=self._region_name,
+                        endpoint_url=self._endpoint_url,
+                    )
+            local.resource = type(self._resource)(client=client)
+            local.tables = {}
+            local.generation = self._generation
+        if table_name not in local.tables:
+            local.tables[table_name] = local.resource.Table(table_name)
+        return local.tables[table_name]
+
+
+class PooledTable:
+    """Table handle that resolves to the calling thread's own Table"""
+
+    def __init__(self, pool: ClientPool, table_name: str) -> None:
+        self._pool = pool
+        self.name = table_name
+
+    @property
+    def pool(self):
+        return self._pool
+
+    def reserve(self, workers: int):
+        self._pool.reserve(workers)
+        return self
+
+    def __getattr__(self, name: str):
+        return getattr(self._pool._local_table(self.name), name)
+
+
+def get_pool(region_name: str = None, endpoint_url: str = None, **kwargs):
+    with _pools_lock:
+        key = (region_name, endpoint_url)
+        if key not in _pools:
+            _pools[key] = ClientPool(region_name, endpoint_url, **kwargs)
+        return _pools[key]
+
+
+def pooled_table(table_name: str, region_name: str = None, endpoint_url: str = None):
+    return get_pool(region_name, endpoint_url).table(table_name)
+
+
+def clear_pools():
+    with _pools_lock:
+        _pools.clear()
+
+
+def reserve(table, workers: int):
+    # Plain boto3 tables and stand-ins have nothing to size
+    if isinstance(table, PooledTable):
+        table.reserve(workers)
@@ -0,0 +1,103 @@
+import re
+from array import array
+from decimal import Decimal
+from functools import lru_cache
+from itertools import islice
+
+from .conditions import parse_projection
+
+
+def projection_fields(projection_exps: list):
+    if not projection_exps:
+        raise ValueError("Records and columns need projection_exp for a schema.")
+    fields = [path[0] for path in parse_projection(",".join(projection_exps))]
+    return tuple(dict.fromkeys(fields))
+
+
+def _slot_name(field: str):
+    name = re.sub(r"\W", "_", field)
+    return f"_{name}" if name[0].isdigit() else name
+
+
+class Record:
+    __slots__ = ()
+    _fields = ()
+
+    def __init__(self, *values):
+        for slot, value in zip(self.__slots__, values):
+            setattr(self, slot, value)
+
+    def __getitem__(self, field: str):
+        return getattr(self, self.__slots__[self._fields.index(field)])
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return self._fields == other._fields and self.to_tuple() == other.to_tuple()
+        return NotImplemented
+
+    def __repr__(self):
+        values = ", ".join(f"{f}={v!r}" for f, v in zip(self._fields, self.to_tuple()))
+        return f"{type(self).__name__}({values})"
+
+    def to_tuple(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def to_dict(self):
+        return {f: v for f, v in zip(self._fields, self.to_tuple()) if v is not None}
+
+
+@lru_cache(maxsize=256)
+def record_type(fields: tuple):
+    slots = tuple(_slot_name(field) for field in fields)
+    if len(set(slots)) != len(slots):
+        raise ValueError(f"Fields {fields} do not map to distinct slots.")
+    return type("Record", (Record,), {"__slots__": slots, "_fields": fields})
+
+
+def to_records(items, fields: tuple):
+    cls = record_type(fields)
+    for item in items:
+        yield cls(*[item.get(field) for field in fields])
+
+
+def _is_number(value):
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+def pack_column(values: list, use_numpy: bool = False):
+    present = [value for value in values if value is not None]
+    if not present or not all(map(_is_number, present)):
+        return values
+    integral = len(present) == len(values) and all(
+        isinstance(v, int) or (isinstance(v, Decimal) and v == v.to_integral_value())
+        for v in present
+    )
+    if use_numpy:
+        import numpy
+
+        if integral:
+            return numpy.array([int(v) for v in values], dtype=numpy.int64)
+        return numpy.array(
+            [numpy.nan if v is None else float(v) for v in values],
+            dtype=numpy.float64,
+        )
+    if integral:
+        try:
+            return array("q", [int(v) for v in values])
+        except OverflowError:
+            pass
+    return array("d", [float("nan") if v is None else float(v) for v in values])
+
+
+def to_columns(items, fields: tuple, batch_size: int = None, use_numpy=False):
+    items = iter(items)
+    while True:
+        batch = list(islice(items, batch_size)) if batch_size else list(items)
+        if not batch:
+            return
+        yield {
+            field: pack_column([item.get(field) for item in batch], use_numpy)
+            for field in fields
+        }
+        if not batch_size:
+            return
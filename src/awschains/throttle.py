@@ -0,0 +1,157 @@
+from random import uniform
+from threading import Condition, Lock
+from time import monotonic, sleep
+
+from botocore.exceptions import ClientError
+
+THROTTLING_ERRORS = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+}
+
+_controllers = {}
+_controllers_lock = Lock()
+
+
+def backoff(attempt: int, base: float = 0.05, cap: float = 5.0):
+    # Full jitter: sleep a random time up to the exponential ceiling
+    sleep(uniform(0, min(cap, base * 2**attempt)))
+
+
+def consumed_capacity_units(response: dict):
+    capacity = response.get("ConsumedCapacity") or []
+    if isinstance(capacity, dict):
+        capacity = [capacity]
+    return sum(x.get("CapacityUnits", 0) for x in capacity)
+
+
+def retried(response: dict):
+    # botocore retries throttled calls itself and only reports how many it made
+    return response.get("ResponseMetadata", {}).get("RetryAttempts", 0) > 0
+
+
+def controller_for(table_name: str, **kwargs):
+    with _controllers_lock:
+        if table_name not in _controllers:
+            _controllers[table_name] = ThroughputController(**kwargs)
+        return _controllers[table_name]
+
+
+class TokenBucket:
+    def __init__(self, rate: float = None):
+        self._rate = rate
+        self._tokens = rate or 0
+        self._updated = monotonic()
+        self._lock = Lock()
+
+    def _refill(self):
+        now = monotonic()
+        self._tokens = min(
+            self._rate, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def wait(self):
+        if not self._rate:
+            return
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens > 0:
+                    return
+                delay = -self._tokens / self._rate
+            sleep(max(delay, 0.001))
+
+    def consume(self, units: float):
+        # Capacity is only known after the call, so the balance may go negative
+        if not self._rate:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens -= units
+
+
+class ThroughputController:
+    def __init__(
+        self,
+        read_capacity: float = None,
+        write_capacity: float = None,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_retries: int = 10,
+    ):
+        self._buckets = {
+            "read": TokenBucket(read_capacity),
+            "write": TokenBucket(write_capacity),
+        }
+        self._max_concurrency = max_concurrency
+        self._min_concurrency = min_concurrency
+        self._max_retries = max_retries
+        self._concurrency = float(max_concurrency)
+        self._active = 0
+        self._condition = Condition()
+        self._throttled = 0
+
+    @property
+    def concurrency(self):
+        return int(self._concurrency)
+
+    @property
+    def throttled(self):
+        return self._throttled
+
+    def call(self, kind: str, func, **requests):
+        bucket = self._buckets[kind]
+        attempt = 0
+        while True:
+            self._acquire()
+            try:
+                bucket.wait()
+                response = func(**requests)
+            except ClientError as e:
+                if e.response["Error"]["Code"] not in THROTTLING_ERRORS:
+                    raise
+                self._decrease()
+                if attempt >= self._max_retries:
+                    raise
+            else:
+                if retried(response):
+                    self._decrease()
+                else:
+                    self._increase()
+                bucket.consume(consumed_capacity_units(response))
+                return response
+            finally:
+                self._release()
+            backoff(attempt)
+            attempt += 1
+
+    def congested(self):
+        # For signals DynamoDB returns instead of raising, e.g. unprocessed
+        # batch entries
+        self._decrease()
+
+    def _acquire(self):
+        with self._condition:
+            while self._active >= int(self._concurrency):
+                self._condition.wait()
+            self._active += 1
+
+    def _release(self):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def _decrease(self):
+        with self._condition:
+            self._throttled += 1
+            self._concurrency = max(self._min_concurrency, self._concurrency / 2)
+
+    def _increase(self):
+        # Additive increase: roughly one more slot per window of successful calls
+        with self._condition:
+            self._concurrency = min(
+                self._max_concurrency, self._concurrency + 1 / self._concurrency
+            )
+            self._condition.notify_all()
@@ -1,4 +1,10 @@
 import sys
+from decimal import Decimal
+from typing import Type
+
+import boto3
+from moto import mock_dynamodb
+from pytest import FixtureRequest, MonkeyPatch, fixture
 
 sys.path.append("../")
 
@@ -13,3 +19,78 @@ def pytest_itemcollected(item):
     nodes = collect_nodes(item)[::-1]
     node_ids = (x.__doc__.strip() if x.__doc__ else x.__name__ for x in nodes)
     item._nodeid = " :> ".join(node_ids)
+
+
+@fixture(autouse=True)
+def init_modules(request: Type[FixtureRequest], monkeypatch: MonkeyPatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "_")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "_")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-northeast-1")
+    monkeypatch.setenv("SAMPLE_TABLE", "sample_table")
+
+    import data
+
+    # Define mocks
+    mock = mock_dynamodb()
+    mock.start()
+    table = data.setup_dynamodb_table()
+    # Init DB
+    [
+        table.put_item(Item=d)
+        for d in data.read_json("database/database", float_as=Decimal)
+    ]
+    request.instance.init = (data, table)
+    yield
+    mock.stop()
+
+
+@fixture
+def indexed_table():
+    from src.awschains.dynamochain import PutItem
+    from src.awschains.planner import clear_schema_cache
+
+    clear_schema_cache()
+    table = boto3.resource("dynamodb").create_table(
+        TableName="indexed_table",
+        KeySchema=[
+            {"AttributeName": "ForumName", "KeyType": "HASH"},
+            {"AttributeName": "Subject", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "ForumName", "AttributeType": "S"},
+            {"AttributeName": "Subject", "AttributeType": "S"},
+            {"AttributeName": "LastPostedBy", "AttributeType": "S"},
+            {"AttributeName": "LastPostedDateTime", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "ByUser",
+                "KeySchema": [
+                    {"AttributeName": "LastPostedBy", "KeyType": "HASH"},
+                    {"AttributeName": "LastPostedDateTime", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "KEYS_ONLY"},
+                "ProvisionedThroughput": {
+                    "ReadCapacityUnits": 1,
+                    "WriteCapacityUnits": 1,
+                },
+            }
+        ],
+        ProvisionedThroughput={"ReadCapacityUnits": 1, "WriteCapacityUnits": 1},
+    )
+    [
+        PutItem(table)
+        .attr(
+            {
+                "ForumName": f"Forum {i % 2}",
+                "Subject": f"Thread {i}",
+                "LastPostedBy": f"User {i % 3}",
+                "LastPostedDateTime": f"2015-09-{10 + i}",
+                "Views": i,
+            }
+        )
+        .run()
+        for i in range(6)
+    ]
+    yield table
+    clear_schema_cache()
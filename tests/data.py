@@ -35,3 +35,21 @@ def read_json(file_path: str, float_as=float):
     with open(f"{file_path}.json") as f:
         item = json.load(f, parse_float=float_as)
     return item
+
+
+class SegmentedTable:
+    """Segment/TotalSegmentsを解釈するテーブルラッパー"""
+
+    def __init__(self, table):
+        self._table = table
+
+    def scan(self, Segment=0, TotalSegments=1, Select=None, **kwargs):
+        response = self._table.scan(**kwargs)
+        response["Items"] = [
+            item
+            for item in response["Items"]
+            if sum(map(ord, item["Subject"])) % TotalSegments == Segment
+        ]
+        if Select == "COUNT":
+            response["Count"] = len(response.pop("Items"))
+        return response
@@ -0,0 +1,134 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import Attr, Key
+
+from src.awschains.asyncchain import AsyncPutItem, AsyncQuery, AsyncScan
+
+
+class TestAsyncWrapper:
+    """Async DynamoDB Wrapper"""
+
+    class TestAsyncScan:
+        """AsyncScan"""
+
+        def test_case_1(self):
+            """Await run"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            actual = asyncio.run(AsyncScan(table).limit(1).run())
+            # Confirm
+            expected = data.read_json("data/expected_scan1", float_as=Decimal)
+            assert expected == actual
+
+        def test_case_2(self):
+            """Iterate items with async for"""
+
+            # Init modules
+            data, table = self.init
+
+            async def collect():
+                return [item async for item in AsyncScan(table).limit(1).max_items(3)]
+
+            # Execute
+            actual = asyncio.run(collect())
+            # Confirm
+            expected = data.read_json("data/expected_scan1", float_as=Decimal)[:3]
+            assert expected == actual
+
+    class TestAsyncQuery:
+        """AsyncQuery"""
+
+        def test_case_1(self):
+            """Gather queries on a bounded executor"""
+
+            # Init modules
+            data, table = self.init
+            executor = ThreadPoolExecutor(max_workers=2)
+
+            async def gather():
+                return await asyncio.gather(
+                    *[
+                        AsyncQuery(table)
+                        .executor(executor)
+                        .key_condition_exp(Key("ForumName").eq("Amazon S3"))
+                        .key_condition_exp(Key("Subject").gte("S3 Thread 2"))
+                        .filter_exp(Attr("LastPostedBy").eq("User A"))
+                        .filter_exp(Attr("Views").eq(1))
+                        .projection_exp("ForumName, Subject, Message")
+                        .projection_exp("LastPostedBy, LastPostedDateTime, Views")
+                        .desc()
+                        .run()
+                        for _ in range(5)
+                    ]
+                )
+
+            # Execute
+            actual = asyncio.run(gather())
+            # Confirm
+            expected = data.read_json("data/expected_query2", float_as=Decimal)
+            assert [expected] * 5 == actual
+
+        def test_case_2(self):
+            """Await count"""
+
+            # Init modules
+            _, table = self.init
+            # Execute
+            actual = asyncio.run(
+                AsyncQuery(table)
+                .partition_key_exp(Key("ForumName").eq("Amazon DynamoDB"))
+                .count()
+            )
+            # Confirm
+            assert 2 == actual
+
+        def test_case_3(self):
+            """Merge fanned out partitions with async for"""
+
+            # Init modules
+            _, table = self.init
+
+            async def collect():
+                return [
+                    item["Subject"]
+                    async for item in AsyncQuery(table)
+                    .fan_out("ForumName", ["Amazon S3", "Amazon DynamoDB"])
+                    .limit(1)
+                    .max_items(3)
+                ]
+
+            # Execute
+            actual = asyncio.run(collect())
+            # Confirm
+            expected = ["DynamoDB Thread 1", "DynamoDB Thread 2", "S3 Thread 1"]
+            assert expected == actual
+
+    class TestAsyncPutItem:
+        """AsyncPutItem"""
+
+        def test_case_1(self):
+            """Await put"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            asyncio.run(
+                AsyncPutItem(table)
+                .partition_key("ForumName", "Amazon S3")
+                .sort_key("Subject", "S3 Thread 3")
+                .attr("Message", "S3 thread 3 message")
+                .attr("LastPostedBy", "User A")
+                .attr("LastPostedDateTime", "2015-09-29T19:58:22.514Z")
+                .attr("Views", 2)
+                .attr("Replies", 0)
+                .attr("Answered", 0)
+                .attr("Tags", ["largeobjects", "multipart upload"])
+                .run()
+            )
+            # Confirm
+            expected = data.read_json("data/expected_put1-2", float_as=Decimal)
+            assert expected == asyncio.run(AsyncScan(table).run())
@@ -0,0 +1,29 @@
+from benchmarks.bench_dynamochain import generate_items, load_table, run
+
+
+class TestBenchmarks:
+    """Benchmarks"""
+
+    def test_case_1(self):
+        """Page through the in-memory table"""
+
+        # Init modules
+        table = load_table(generate_items(2500))
+        # Execute
+        actual = table.scan(Limit=1000)
+        following = table.scan(ExclusiveStartKey=actual["LastEvaluatedKey"])
+        # Confirm
+        assert 1000 == actual["Count"]
+        assert 1500 == following["Count"]
+        key = lambda x: (x["ForumName"], x["Subject"])  # noqa: E731
+        assert key(actual["Items"][-1]) < key(following["Items"][0])
+
+    def test_case_2(self):
+        """Report every benchmark in machine-readable form"""
+
+        # Execute
+        actual = run([200], repeat=1)
+        # Confirm
+        names = {result["name"] for result in actual["results"]}
+        assert {"build.boto3_query", "scan.run", "put_item.run", "memory.run"} <= names
+        assert all(0 < result["value"] for result in actual["results"])
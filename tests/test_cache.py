@@ -0,0 +1,173 @@
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import Key
+from pytest import MonkeyPatch
+
+from src.awschains.cache import ResultCache
+from src.awschains.dynamochain import (
+    BatchGet,
+    BatchWrite,
+    PutItem,
+    Query,
+    Scan,
+    UpdateItem,
+)
+
+
+class TestResultCache:
+    """Result Cache"""
+
+    def test_case_1(self):
+        """Serve repeated reads from the cache"""
+
+        # Init modules
+        data, table = self.init
+        cache = ResultCache()
+        # Execute
+        [Scan(table).cache(cache).run() for _ in range(3)]
+        actual = Scan(table).cache(cache).run()
+        # Confirm
+        expected = data.read_json("data/expected_scan1", float_as=Decimal)
+        assert expected == actual
+        assert 3 == cache.stats()["Hits"]
+        assert 1 == cache.stats()["Misses"]
+
+    def test_case_2(self):
+        """Separate entries for consistent reads"""
+
+        # Init modules
+        _, table = self.init
+        cache = ResultCache()
+        # Execute
+        Scan(table).cache(cache).run()
+        Scan(table).cache(cache).consistent_read().run()
+        # Confirm
+        assert 2 == cache.stats()["Misses"]
+        assert 2 == cache.stats()["Entries"]
+
+    def test_case_3(self):
+        """Invalidate entries of the written partition"""
+
+        # Init modules
+        _, table = self.init
+        cache = ResultCache()
+
+        def query(forum):
+            return (
+                Query(table)
+                .cache(cache)
+                .partition_key_exp(Key("ForumName").eq(forum))
+                .run()
+            )
+
+        query("Amazon S3")
+        query("Amazon DynamoDB")
+        # Execute
+        PutItem(table).attr({"ForumName": "Amazon S3", "Subject": "S3 Thread 3"}).run()
+        s3 = query("Amazon S3")
+        query("Amazon DynamoDB")
+        # Confirm
+        assert 3 == len(s3)
+        assert 1 == cache.stats()["Invalidations"]
+        assert 1 == cache.stats()["Hits"]
+
+    def test_case_4(self):
+        """Invalidate table-wide entries on batch writes"""
+
+        # Init modules
+        _, table = self.init
+        cache = ResultCache()
+        Scan(table).cache(cache).count()
+        # Execute
+        BatchWrite(table).delete(
+            {"ForumName": "Amazon S3", "Subject": "S3 Thread 1"}
+        ).run()
+        actual = Scan(table).cache(cache).count()
+        # Confirm
+        assert 3 == actual
+        assert 2 == cache.stats()["Misses"]
+
+    def test_case_5(self):
+        """Evict expired and oversized entries"""
+
+        # Init modules
+        _, table = self.init
+        expired = ResultCache(ttl=0)
+        small = ResultCache(max_bytes=4096)
+        # Execute
+        [Scan(table).cache(expired).run() for _ in range(2)]
+        [
+            Query(table)
+            .cache(small)
+            .partition_key_exp(Key("ForumName").eq(forum))
+            .run()
+            for forum in ["Amazon S3", "Amazon DynamoDB"]
+        ]
+        # Confirm
+        assert 1 == expired.stats()["Evictions"]
+        assert 1 == small.stats()["Evictions"]
+        assert 4096 >= small.stats()["Bytes"]
+
+    def test_case_6(self, monkeypatch: MonkeyPatch):
+        """Fetch only the batch keys missing from the cache"""
+
+        # Init modules
+        _, table = self.init
+        cache = ResultCache()
+        client = table.meta.client
+        batch_get_item = client.batch_get_item
+        calls = []
+
+        def counted(RequestItems, **kwargs):
+            calls.append(RequestItems[table.name]["Keys"])
+            return batch_get_item(RequestItems=RequestItems, **kwargs)
+
+        monkeypatch.setattr(client, "batch_get_item", counted)
+
+        def batch_get(*subjects):
+            return (
+                BatchGet(table)
+                .cache(cache)
+                .keys({"ForumName": "Amazon S3", "Subject": x} for x in subjects)
+                .projection_exp("Views")
+                .run()
+            )
+
+        batch_get("S3 Thread 1", "S3 Thread 9")
+        # Execute
+        actual = batch_get("S3 Thread 1", "S3 Thread 2", "S3 Thread 9")
+        PutItem(table).attr(
+            {"ForumName": "Amazon S3", "Subject": "S3 Thread 1", "Views": 5}
+        ).run()
+        updated = batch_get("S3 Thread 1", "S3 Thread 2")
+        # Confirm
+        assert [{"Views": 0}, {"Views": 1}] == actual
+        assert [{"Views": 5}, {"Views": 1}] == updated
+        assert [2, 1, 1] == [len(keys) for keys in calls]
+        assert {"Subject": "S3 Thread 2", "ForumName": "Amazon S3"} == calls[1][0]
+
+    def test_case_7(self, indexed_table):
+        """Invalidate index reads on any write to the table"""
+
+        # Init modules
+        cache = ResultCache()
+        key = {"ForumName": "Forum 0", "Subject": "Thread 0"}
+
+        def query():
+            return [
+                item["Subject"]
+                for item in Query(indexed_table)
+                .cache(cache)
+                .index_name("ByUser")
+                .partition_key_exp(Key("LastPostedBy").eq("User 0"))
+                .run()
+            ]
+
+        before = query()
+        # Execute
+        UpdateItem(indexed_table).attr(key).set("LastPostedBy", "User 1").run()
+        actual = query()
+        # Confirm
+        assert ["Thread 0", "Thread 3"] == before
+        assert ["Thread 3"] == actual
+        assert 2 == cache.stats()["Misses"]
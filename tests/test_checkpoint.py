@@ -0,0 +1,55 @@
+import json
+from decimal import Decimal
+
+from pytest import raises
+
+from src.awschains.dynamochain import Scan
+
+
+class TestScanCheckpoint:
+    """Scan Checkpoint"""
+
+    def test_case_1(self, tmp_path):
+        """Resume a serial scan from the last consumed page"""
+
+        # Init modules
+        data, table = self.init
+        path = str(tmp_path / "scan.json")
+        Scan(table).limit(1).max_items(2).checkpoint(path).run()
+        # Execute
+        actual = Scan(table).limit(1).checkpoint(path).run()
+        finished = Scan(table).limit(1).checkpoint(path).run()
+        # Confirm
+        expected = data.read_json("data/expected_scan1", float_as=Decimal)[1:]
+        assert expected == actual
+        assert [] == finished
+
+    def test_case_2(self, tmp_path):
+        """Save a cursor per segment every N pages"""
+
+        # Init modules
+        data, table = self.init
+        path = tmp_path / "scan.json"
+        # Execute
+        actual = (
+            Scan(data.SegmentedTable(table)).parallel(2).checkpoint(str(path), every=10)
+        )
+        items = actual.limit(1).run()
+        # Confirm
+        state = json.loads(path.read_text())
+        assert 4 == len(items)
+        assert 2 == state["TotalSegments"]
+        assert {"0", "1"} == set(state["Segments"])
+        assert all(cursor["Done"] for cursor in state["Segments"].values())
+        assert [] == Scan(table).parallel(2).checkpoint(str(path)).run()
+
+    def test_case_3(self, tmp_path):
+        """Reject a checkpoint taken with other segments"""
+
+        # Init modules
+        _, table = self.init
+        path = str(tmp_path / "scan.json")
+        Scan(table).checkpoint(path).run()
+        # Execute & Confirm
+        with raises(ValueError):
+            Scan(table).parallel(2).checkpoint(path).run()
@@ -0,0 +1,283 @@
+from decimal import Decimal
+
+import boto3
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+from pytest import MonkeyPatch, raises
+
+from src.awschains.client import ClientTable, LazyItem, make_deserializer
+from src.awschains.dynamochain import (
+    BatchGet,
+    BatchWrite,
+    PutItem,
+    Query,
+    Scan,
+    TransactWrite,
+    UpdateItem,
+)
+
+
+class TestClientTable:
+    """Client Table"""
+
+    def client_table(self, numbers="decimal", lazy=False):
+        _, table = self.init
+        client = boto3.client("dynamodb")
+        return ClientTable(client, table.name, numbers=numbers, lazy=lazy)
+
+    def test_case_1(self):
+        """Scan across pages with decimal numbers"""
+
+        # Init modules
+        data, _ = self.init
+        # Execute
+        actual = Scan(self.client_table()).limit(1).run()
+        # Confirm
+        expected = data.read_json("data/expected_scan1", float_as=Decimal)
+        assert expected == actual
+
+    def test_case_2(self):
+        """Query with native numbers"""
+
+        # Init modules
+        data, _ = self.init
+        # Execute
+        actual = (
+            Query(self.client_table("native"))
+            .key_condition_exp(Key("ForumName").eq("Amazon S3"))
+            .key_condition_exp(Key("Subject").gte("S3 Thread 2"))
+            .filter_exp(Attr("LastPostedBy").eq("User A"))
+            .filter_exp(Attr("Views").eq(1))
+            .projection_exp("ForumName, Subject, Message")
+            .projection_exp("LastPostedBy, LastPostedDateTime, Views")
+            .desc()
+            .run()
+        )
+        # Confirm
+        expected = data.read_json("data/expected_query2")
+        assert expected == actual
+        assert int is type(actual[0]["Views"])
+
+    def test_case_3(self):
+        """Pass raw items through"""
+
+        # Execute
+        actual = (
+            Query(self.client_table("raw"))
+            .partition_key_exp(Key("ForumName").eq("Amazon S3"))
+            .projection_exp("Subject, Views")
+            .run()
+        )
+        # Confirm
+        expected = [
+            {"Subject": {"S": "S3 Thread 1"}, "Views": {"N": "0"}},
+            {"Subject": {"S": "S3 Thread 2"}, "Views": {"N": "1"}},
+        ]
+        assert expected == actual
+
+    def test_case_4(self):
+        """Put items with conditions"""
+
+        # Init modules
+        table = self.client_table("native")
+        # Execute
+        (
+            PutItem(table)
+            .partition_key("ForumName", "Amazon S3")
+            .sort_key("Subject", "S3 Thread 3")
+            .attr("Score", 1.5)
+            .attr("Info", {"Ratio": 0.25})
+            .condition_exp(Attr("ForumName").not_exists())
+            .run()
+        )
+        with raises(ClientError) as e:
+            (
+                PutItem(table)
+                .attr({"ForumName": "Amazon S3", "Subject": "S3 Thread 3"})
+                .condition_exp(Attr("ForumName").not_exists())
+                .run()
+            )
+        # Confirm
+        actual = Scan(table).filter_exp(Attr("Subject").eq("S3 Thread 3")).run()
+        assert [1.5, {"Ratio": 0.25}] == [actual[0]["Score"], actual[0]["Info"]]
+        assert "ConditionalCheckFailedException" == e.typename
+
+    def test_case_5(self):
+        """Deserialize every attribute type"""
+
+        # Init modules
+        deserialize = make_deserializer("native")
+        # Execute
+        actual = deserialize(
+            {
+                "M": {
+                    "B": {"B": b"\x00"},
+                    "BOOL": {"BOOL": True},
+                    "NULL": {"NULL": True},
+                    "SS": {"SS": ["a", "b"]},
+                    "NS": {"NS": ["1", "2.5"]},
+                    "BS": {"BS": [b"\x01"]},
+                    "L": {"L": [{"N": "1e3"}, {"S": "x"}]},
+                }
+            }
+        )
+        # Confirm
+        expected = {
+            "B": b"\x00",
+            "BOOL": True,
+            "NULL": None,
+            "SS": {"a", "b"},
+            "NS": {1, 2.5},
+            "BS": {b"\x01"},
+            "L": [1000.0, "x"],
+        }
+        assert expected == actual
+        with raises(ValueError):
+            make_deserializer("float")
+
+    def test_case_6(self):
+        """Return lazy item views"""
+
+        # Init modules
+        data, _ = self.init
+        # Execute
+        actual = Scan(self.client_table(lazy=True)).limit(3).run()
+        # Confirm
+        expected = data.read_json("data/expected_scan1", float_as=Decimal)
+        assert expected == actual
+        assert all(isinstance(item, LazyItem) for item in actual)
+
+    def test_case_7(self):
+        """Deserialize attributes once on first access"""
+
+        # Init modules
+        calls = []
+        deserialize = make_deserializer()
+
+        def counted(value):
+            calls.append(value)
+            return deserialize(value)
+
+        item = LazyItem({"Subject": {"S": "x"}, "Views": {"N": "1"}}, counted)
+        # Execute
+        [item["Views"] for _ in range(3)]
+        # Confirm
+        assert [{"N": "1"}] == calls
+        assert {"Subject": "x", "Views": Decimal(1)} == item.to_dict()
+        assert 2 == len(item)
+
+    def test_case_8(self, monkeypatch: MonkeyPatch):
+        """Leave out empty placeholder maps"""
+
+        # Init modules
+        table = self.client_table("native")
+        put_item = table._client.put_item
+        calls = []
+
+        def counted(**requests):
+            calls.append(requests)
+            return put_item(**requests)
+
+        monkeypatch.setattr(table._client, "put_item", counted)
+        # Execute
+        (
+            PutItem(table)
+            .attr({"ForumName": "Amazon S3", "Subject": "S3 Thread 3"})
+            .condition_exp(Attr("ForumName").not_exists())
+            .run()
+        )
+        # Confirm
+        assert "ExpressionAttributeNames" in calls[0]
+        assert "ExpressionAttributeValues" not in calls[0]
+
+    def test_case_9(self):
+        """Merge fan out partitions by the described sort key"""
+
+        # Init modules
+        table = self.client_table("native")
+        # Execute
+        actual = [
+            item["Subject"]
+            for item in Query(table)
+            .fan_out("ForumName", ["Amazon S3", "Amazon DynamoDB"])
+            .projection_exp("Subject")
+            .run()
+        ]
+        # Confirm
+        expected = [
+            "DynamoDB Thread 1",
+            "DynamoDB Thread 2",
+            "S3 Thread 1",
+            "S3 Thread 2",
+        ]
+        assert expected == actual
+
+    def test_case_10(self):
+        """Run updates, batches and transactions"""
+
+        # Init modules
+        table = self.client_table("native")
+        key = {"ForumName": "Amazon S3", "Subject": "S3 Thread 1"}
+        # Execute
+        updated = UpdateItem(table).attr(key).add("Views", 2).return_values().run()
+        written = (
+            BatchWrite(table)
+            .put({"ForumName": "Bulk", "Subject": "T1", "Ratio": 0.5})
+            .put({"ForumName": "Bulk", "Subject": "T2", "Labels": {"a"}})
+            .delete({"ForumName": "Amazon S3", "Subject": "S3 Thread 2"})
+            .run()
+        )
+        transaction = (
+            TransactWrite(table)
+            .update({"ForumName": "Bulk", "Subject": "T1"}, {"Ratio": 0.25})
+            .delete({"ForumName": "Bulk", "Subject": "T2"}, Attr("Labels").exists())
+            .run()
+        )
+        actual = (
+            BatchGet(table)
+            .keys(
+                [
+                    key,
+                    {"ForumName": "Bulk", "Subject": "T1"},
+                    {"ForumName": "Bulk", "Subject": "T2"},
+                ]
+            )
+            .projection_exp("Subject, Views, Ratio")
+            .run()
+        )
+        # Confirm
+        assert 2 == updated["Views"]
+        assert 3 == written["WrittenCount"]
+        assert 1 == transaction["TransactionCount"]
+        assert [
+            {"Subject": "S3 Thread 1", "Views": 2},
+            {"Subject": "T1", "Ratio": 0.25},
+        ] == sorted(actual, key=lambda item: item["Subject"])
+
+    def test_case_11(self, monkeypatch: MonkeyPatch):
+        """Resubmit unprocessed batch entries"""
+
+        # Init modules
+        table = self.client_table("native")
+        batch_write_item = table._client.batch_write_item
+        calls = []
+
+        def flaky_batch_write_item(RequestItems, **kwargs):
+            calls.append(RequestItems)
+            if len(calls) > 1:
+                return batch_write_item(RequestItems=RequestItems, **kwargs)
+            return {"UnprocessedItems": RequestItems}
+
+        monkeypatch.setattr(table._client, "batch_write_item", flaky_batch_write_item)
+        # Execute
+        actual = (
+            BatchWrite(table)
+            .put({"ForumName": "Bulk", "Subject": "T1", "Ratio": 0.5})
+            .run()
+        )
+        # Confirm
+        assert 1 == actual["WrittenCount"]
+        assert 1 == actual["RetryCount"]
+        assert calls[0] == calls[1]
+        item = Query(table).partition_key_exp(Key("ForumName").eq("Bulk")).run()[0]
+        assert 0.5 == item["Ratio"]
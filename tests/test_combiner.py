@@ -0,0 +1,157 @@
+from time import sleep
+
+from botocore.exceptions import ClientError
+from pytest import MonkeyPatch, raises
+
+from src.awschains.combiner import UpdateCombiner
+from src.awschains.dynamochain import PutItem
+
+
+class TestUpdateCombiner:
+    """Update Combiner"""
+
+    def count_calls(self, monkeypatch: MonkeyPatch):
+        _, table = self.init
+        update_item = table.update_item
+        calls = []
+
+        def counted_update_item(**kwargs):
+            calls.append(kwargs)
+            return update_item(**kwargs)
+
+        monkeypatch.setattr(table, "update_item", counted_update_item)
+        return calls
+
+    def get(self, subject: str):
+        _, table = self.init
+        key = {"ForumName": "Amazon S3", "Subject": subject}
+        return table.get_item(Key=key)["Item"]
+
+    def test_case_1(self, monkeypatch: MonkeyPatch):
+        """Merge increments and set-adds into one update"""
+
+        # Init modules
+        _, table = self.init
+        calls = self.count_calls(monkeypatch)
+        key = {"ForumName": "Amazon S3", "Subject": "S3 Thread 2"}
+        # Execute
+        with UpdateCombiner(table, window=60) as combiner:
+            [combiner.add(key, "Views") for _ in range(1000)]
+            combiner.add(key, "Labels", {"hot"}).add(key, "Labels", {"new"})
+        # Confirm
+        actual = self.get("S3 Thread 2")
+        assert 1001 == actual["Views"]
+        assert {"hot", "new"} == actual["Labels"]
+        assert 1 == len(calls)
+        assert calls[0]["UpdateExpression"].startswith("ADD ")
+
+    def test_case_2(self, monkeypatch: MonkeyPatch):
+        """Flush when too many keys are pending"""
+
+        # Init modules
+        _, table = self.init
+        calls = self.count_calls(monkeypatch)
+        combiner = UpdateCombiner(table, window=60, max_keys=2)
+        # Execute
+        combiner.add(
+            PutItem(table)
+            .partition_key("ForumName", "Amazon S3")
+            .sort_key("Subject", "S3 Thread 1"),
+            "Views",
+            2,
+        )
+        combiner.add({"ForumName": "Amazon S3", "Subject": "S3 Thread 2"}, "Views", 3)
+        # Confirm
+        assert 2 == len(calls)
+        assert 2 == self.get("S3 Thread 1")["Views"]
+        assert 4 == self.get("S3 Thread 2")["Views"]
+
+    def test_case_3(self, monkeypatch: MonkeyPatch):
+        """Flush when the window has passed"""
+
+        # Init modules
+        _, table = self.init
+        calls = self.count_calls(monkeypatch)
+        combiner = UpdateCombiner(table, window=0.01)
+        key = {"ForumName": "Amazon S3", "Subject": "S3 Thread 1"}
+        # Execute
+        combiner.add(key, "Views", 5)
+        [sleep(0.01) for _ in range(500) if not calls]
+        # Confirm
+        assert 1 == len(calls)
+        assert 5 == self.get("S3 Thread 1")["Views"]
+
+    def test_case_4(self, monkeypatch: MonkeyPatch):
+        """Keep rejected deltas and write every other key"""
+
+        # Init modules
+        _, table = self.init
+        update_item = table.update_item
+        rejected = {"S3 Thread 1"}
+
+        def rejecting_update_item(**kwargs):
+            if kwargs["Key"]["Subject"] in rejected:
+                error = {"Error": {"Code": "ProvisionedThroughputExceededException"}}
+                raise ClientError(error, "UpdateItem")
+            return update_item(**kwargs)
+
+        monkeypatch.setattr(table, "update_item", rejecting_update_item)
+        combiner = UpdateCombiner(table, window=60)
+        combiner.add({"ForumName": "Amazon S3", "Subject": "S3 Thread 1"}, "Views", 2)
+        combiner.add({"ForumName": "Amazon S3", "Subject": "S3 Thread 2"}, "Views", 5)
+        # Execute
+        with raises(ClientError):
+            combiner.flush()
+        written = self.get("S3 Thread 2")["Views"]
+        rejected.clear()
+        combiner.flush()
+        # Confirm
+        assert 6 == written
+        assert 2 == self.get("S3 Thread 1")["Views"]
+        assert 6 == self.get("S3 Thread 2")["Views"]
+
+    def test_case_5(self, monkeypatch: MonkeyPatch):
+        """Keep errors of timed flushes for the next flush"""
+
+        # Init modules
+        _, table = self.init
+        calls = []
+
+        def failing_update_item(**kwargs):
+            calls.append(kwargs)
+            raise ClientError({"Error": {"Code": "InternalServerError"}}, "UpdateItem")
+
+        monkeypatch.setattr(table, "update_item", failing_update_item)
+        combiner = UpdateCombiner(table, window=0.01)
+        combiner.add({"ForumName": "Amazon S3", "Subject": "S3 Thread 1"}, "Views", 5)
+        [sleep(0.01) for _ in range(500) if not calls]
+        monkeypatch.undo()
+        # Execute
+        combiner.add({"ForumName": "Amazon S3", "Subject": "S3 Thread 2"}, "Views", 2)
+        errors = combiner.errors
+        with raises(ClientError):
+            combiner.flush()
+        combiner.flush()
+        # Confirm
+        assert ["InternalServerError"] == [e.response["Error"]["Code"] for e in errors]
+        assert [] == combiner.errors
+        assert 5 == self.get("S3 Thread 1")["Views"]
+        assert 3 == self.get("S3 Thread 2")["Views"]
+
+    def test_case_6(self, monkeypatch: MonkeyPatch):
+        """Drop deltas DynamoDB will never accept"""
+
+        # Init modules
+        _, table = self.init
+        calls = self.count_calls(monkeypatch)
+        combiner = UpdateCombiner(table, window=60)
+        combiner.add({"ForumName": "Amazon S3", "Subject": "S3 Thread 1"}, "Message", 1)
+        combiner.add({"ForumName": "Amazon S3", "Subject": "S3 Thread 2"}, "Views", 2)
+        # Execute
+        with raises(ClientError) as e:
+            combiner.flush()
+        combiner.flush()
+        # Confirm
+        assert "ValidationException" == e.value.response["Error"]["Code"]
+        assert 2 == len(calls)
+        assert 3 == self.get("S3 Thread 2")["Views"]
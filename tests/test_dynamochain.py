@@ -1,35 +1,21 @@
 from decimal import Decimal
-from typing import Type
+from time import perf_counter, sleep
 
 from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
-from moto import mock_dynamodb
-from pytest import FixtureRequest, MonkeyPatch, fixture, mark, raises
+from pytest import MonkeyPatch, mark, raises
 
-from src.awschains.dynamochain import PutItem, Query, Scan
-
-
-@fixture(autouse=True)
-def init_modules(request: Type[FixtureRequest], monkeypatch: MonkeyPatch):
-    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "_")
-    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "_")
-    monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-northeast-1")
-    monkeypatch.setenv("SAMPLE_TABLE", "sample_table")
-
-    import data
-
-    # Define mocks
-    mock = mock_dynamodb()
-    mock.start()
-    table = data.setup_dynamodb_table()
-    # Init DB
-    [
-        table.put_item(Item=d)
-        for d in data.read_json("database/database", float_as=Decimal)
-    ]
-    request.instance.init = (data, table)
-    yield
-    mock.stop()
+from src.awschains.conditions import ChainsConditionBuilder, Param
+from src.awschains.dynamochain import (
+    BatchGet,
+    BatchWrite,
+    PutItem,
+    Query,
+    Scan,
+    TransactWrite,
+    UpdateItem,
+)
+from src.awschains.memory import MemoryTable
 
 
 class TestWrapper:
@@ -67,6 +53,81 @@ class TestWrapper:
             expected = 1
             assert expected == actual
 
+        def test_case_3(self):
+            """Sum counts across pages"""
+
+            # Init modules
+            _, table = self.init
+            # Execute
+            actual = Scan(table).limit(1).count()
+            # Confirm
+            expected = 4
+            assert expected == actual
+
+        def test_case_4(self):
+            """Count segments in parallel"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            actual = Scan(data.SegmentedTable(table)).limit(1).count(total_segments=3)
+            # Confirm
+            expected = 4
+            assert expected == actual
+
+        def test_case_5(self):
+            """Count fanned out partitions in parallel"""
+
+            # Init modules
+            _, table = self.init
+            # Execute
+            actual = (
+                Query(table)
+                .fan_out("ForumName", ["Amazon DynamoDB", "Amazon S3", "Missing"])
+                .sort_key_exp(Key("Subject").begins_with("S3"))
+                .count()
+            )
+            # Confirm
+            expected = 2
+            assert expected == actual
+
+        def test_case_6(self, monkeypatch: MonkeyPatch):
+            """Read the approximate count from the table description"""
+
+            # Init modules
+            _, table = self.init
+            client = table.meta.client
+            describe_table = client.describe_table
+            calls = []
+
+            def counted_describe_table(**kwargs):
+                calls.append(kwargs)
+                return describe_table(**kwargs)
+
+            monkeypatch.setattr(client, "describe_table", counted_describe_table)
+            # Execute
+            approximate = Scan(table).count(approximate=True)
+            filtered = (
+                Scan(table).filter_exp(Attr("Views").eq(1)).count(approximate=True)
+            )
+            # Confirm
+            assert 4 == approximate
+            assert 1 == filtered
+            assert 1 == len(calls)
+
+        def test_case_7(self):
+            """Keep reading items after a count"""
+
+            # Init modules
+            _, table = self.init
+            chain = Scan(table).projection_exp("Subject")
+            # Execute
+            chain.count()
+            actual = chain.run()
+            # Confirm
+            assert 4 == len(actual)
+            assert {"Subject"} == set(actual[0])
+
     class TestScan:
         """Scan"""
 
@@ -98,6 +159,120 @@ class TestWrapper:
             expected = data.read_json("data/expected_scan2", float_as=Decimal)
             assert expected == actual
 
+        def test_case_3(self):
+            """Follow LastEvaluatedKey across pages"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            actual = Scan(table).limit(1).run()
+            # Confirm
+            expected = data.read_json("data/expected_scan1", float_as=Decimal)
+            assert expected == actual
+
+        def test_case_4(self):
+            """Prefetch next page in background"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            actual = Scan(table).limit(1).prefetch().run()
+            # Confirm
+            expected = data.read_json("data/expected_scan1", float_as=Decimal)
+            assert expected == actual
+
+        def test_case_5(self):
+            """Parallel segments in arrival order"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            actual = (
+                Scan(data.SegmentedTable(table))
+                .filter_exp(Attr("LastPostedBy").eq("User A"))
+                .limit(1)
+                .parallel(3, max_workers=2)
+                .run()
+            )
+            # Confirm
+            expected = data.read_json("data/expected_scan1", float_as=Decimal)
+            key = lambda x: (x["ForumName"], x["Subject"])  # noqa: E731
+            assert sorted(expected, key=key) == sorted(actual, key=key)
+
+        def test_case_6(self):
+            """Parallel segments grouped by segment"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            actual = [
+                item["Subject"]
+                for item in Scan(data.SegmentedTable(table))
+                .projection_exp("Subject")
+                .parallel(2, group_by_segment=True)
+                .run()
+            ]
+            # Confirm
+            expected = [
+                "DynamoDB Thread 2",
+                "S3 Thread 2",
+                "DynamoDB Thread 1",
+                "S3 Thread 1",
+            ]
+            assert expected == actual
+
+        def test_case_7(self):
+            """Stream items one at a time"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            actual = list(Scan(table).limit(3).iter_items())
+            # Confirm
+            expected = data.read_json("data/expected_scan1", float_as=Decimal)
+            assert expected == actual
+
+        def test_case_8(self):
+            """Stop paginating once max items are returned"""
+
+            # Init modules
+            data, table = self.init
+            scan = Scan(table).limit(1).max_items(2)
+            # Execute
+            actual = scan.run()
+            # Confirm
+            expected = data.read_json("data/expected_scan1", float_as=Decimal)[:2]
+            assert expected == actual
+            assert scan._exclusive_start_key is not None
+
+        def test_case_9(self, monkeypatch: MonkeyPatch):
+            """Hold back parallel segments while the consumer is slow"""
+
+            # Init modules
+            table = MemoryTable("memory_table", "ForumName", "Subject")
+            [
+                table.put_item(Item={"ForumName": f"Forum {i % 4}", "Subject": f"{i}"})
+                for i in range(400)
+            ]
+            scan = table.scan
+            calls = []
+
+            def counted_scan(**kwargs):
+                calls.append(kwargs)
+                return scan(**kwargs)
+
+            monkeypatch.setattr(table, "scan", counted_scan)
+            pages = Scan(table).limit(1).parallel(4, group_by_segment=True).iter()
+            # Execute
+            next(pages)
+            sleep(0.3)
+            fetched = len(calls)
+            start = perf_counter()
+            pages.close()
+            # Confirm
+            assert fetched <= 4 * (Scan.PAGES_PER_WORKER + 1) + 1
+            assert perf_counter() - start < 1
+
     class TestQuery:
         """Query"""
 
@@ -142,6 +317,62 @@ class TestWrapper:
             expected = data.read_json("data/expected_query2", float_as=Decimal)
             assert expected == actual
 
+        def test_case_3(self):
+            """Follow LastEvaluatedKey across pages"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            actual = (
+                Query(table)
+                .partition_key_exp(Key("ForumName").eq("Amazon DynamoDB"))
+                .limit(1)
+                .desc()
+                .prefetch()
+                .run()
+            )
+            # Confirm
+            expected = data.read_json("data/expected_query1", float_as=Decimal)
+            assert expected == actual
+
+        def test_case_4(self):
+            """Fan out over partitions and merge by sort key"""
+
+            # Init modules
+            _, table = self.init
+            # Execute
+            actual = [
+                item["Subject"]
+                for item in Query(table)
+                .fan_out("ForumName", ["Amazon DynamoDB", "Amazon S3", "Missing"])
+                .sort_key_exp(Key("Subject").gte("DynamoDB Thread 2"))
+                .filter_exp(Attr("LastPostedBy").eq("User A"))
+                .limit(1)
+                .desc()
+                .run()
+            ]
+            # Confirm
+            expected = ["S3 Thread 2", "S3 Thread 1", "DynamoDB Thread 2"]
+            assert expected == actual
+
+        def test_case_5(self):
+            """Stop fan out at the global limit"""
+
+            # Init modules
+            _, table = self.init
+            # Execute
+            actual = [
+                item["Subject"]
+                for item in Query(table)
+                .fan_out("ForumName", ["Amazon S3", "Amazon DynamoDB"], max_workers=1)
+                .projection_exp("Subject")
+                .max_items(3)
+                .run()
+            ]
+            # Confirm
+            expected = ["DynamoDB Thread 1", "DynamoDB Thread 2", "S3 Thread 1"]
+            assert expected == actual
+
     @mark.skip(reason="Recreate")
     def test_case_delete1(self):
         """Delete1"""
@@ -315,3 +546,456 @@ class TestWrapper:
             actual = e.typename
             expected = "ConditionalCheckFailedException"
             assert expected == actual
+
+    class TestUpdateItem:
+        """UpdateItem"""
+
+        def test_case_1(self):
+            """Set, add and remove attributes"""
+
+            # Init modules
+            _, table = self.init
+            # Execute
+            actual = (
+                UpdateItem(table)
+                .partition_key("ForumName", "Amazon S3")
+                .sort_key("Subject", "S3 Thread 2")
+                .set("LastPostedBy", "User B")
+                .add({"Views": 2, "Labels": {"hot"}})
+                .remove("Answered", "Tags")
+                .return_values("ALL_NEW")
+                .run()
+            )
+            # Confirm
+            assert "User B" == actual["LastPostedBy"]
+            assert 3 == actual["Views"]
+            assert {"hot"} == actual["Labels"]
+            assert "Answered" not in actual and "Tags" not in actual
+
+        def test_case_2(self):
+            """Skip the update when the condition fails"""
+
+            # Init modules
+            _, table = self.init
+            key = {"ForumName": "Amazon S3", "Subject": "S3 Thread 2"}
+            # Execute
+            with raises(ClientError) as e:
+                (
+                    UpdateItem(table)
+                    .attr(key)
+                    .add("Views", 1)
+                    .condition_exp(Attr("Views").gt(5))
+                    .run()
+                )
+            # Confirm
+            assert (
+                "ConditionalCheckFailedException" == e.value.response["Error"]["Code"]
+            )
+            assert 1 == table.get_item(Key=key)["Item"]["Views"]
+
+        def test_case_3(self):
+            """Reject an update without actions"""
+
+            # Init modules
+            _, table = self.init
+            # Execute
+            with raises(ValueError):
+                UpdateItem(table).partition_key("ForumName", "Amazon S3").run()
+
+    class TestBatchWrite:
+        """BatchWrite"""
+
+        def test_case_1(self):
+            """Put and delete via chain, dict and PutItem"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            actual = (
+                BatchWrite(table)
+                .partition_key("ForumName", "Amazon S3")
+                .sort_key("Subject", "S3 Thread 1")
+                .delete()
+                .put(
+                    PutItem(table)
+                    .partition_key(Key("ForumName").eq("Amazon S3"))
+                    .sort_key(Key("Subject").eq("S3 Thread 2"))
+                    .attr(
+                        {
+                            "Message": "S3 thread 2 message",
+                            "LastPostedBy": "User A",
+                            "LastPostedDateTime": "2015-09-29T19:58:22.514Z",
+                            "Views": 2,
+                            "Replies": 0,
+                            "Answered": 0,
+                            "Tags": ["largeobjects", "multipart upload"],
+                        }
+                    )
+                )
+                .put({"ForumName": "Amazon S3", "Subject": "S3 Thread 1"})
+                .delete({"ForumName": "Amazon S3", "Subject": "S3 Thread 1"})
+                .run()
+            )
+            # Confirm
+            assert 2 == actual["WrittenCount"]
+            assert 0 == actual["RetryCount"]
+            expected = [
+                x
+                for x in data.read_json("data/expected_put3-4", float_as=Decimal)
+                if x["Subject"] != "S3 Thread 1"
+            ]
+            assert expected == Scan(table).run()
+
+        def test_case_2(self):
+            """Split into chunks of 25 and flush in parallel"""
+
+            # Init modules
+            _, table = self.init
+            batch = BatchWrite(table).parallel(4)
+            [
+                batch.partition_key("ForumName", "Bulk")
+                .sort_key("Subject", f"Thread {i:03}")
+                .attr("Views", i)
+                .put()
+                for i in range(60)
+            ]
+            # Execute
+            actual = batch.run()
+            # Confirm
+            assert 60 == actual["WrittenCount"]
+            assert (
+                60
+                == Query(table).partition_key_exp(Key("ForumName").eq("Bulk")).count()
+            )
+
+        def test_case_3(self, monkeypatch: MonkeyPatch):
+            """Resubmit unprocessed items"""
+
+            # Init modules
+            _, table = self.init
+            client = table.meta.client
+            batch_write_item = client.batch_write_item
+            calls = []
+
+            def flaky_batch_write_item(RequestItems, **kwargs):
+                calls.append(RequestItems)
+                if len(calls) > 1:
+                    return batch_write_item(RequestItems=RequestItems, **kwargs)
+                requests = RequestItems[table.name]
+                batch_write_item(RequestItems={table.name: requests[:1]}, **kwargs)
+                return {"UnprocessedItems": {table.name: requests[1:]}}
+
+            monkeypatch.setattr(client, "batch_write_item", flaky_batch_write_item)
+            # Execute
+            actual = (
+                BatchWrite(table)
+                .put({"ForumName": "Bulk", "Subject": "Thread 1"})
+                .put({"ForumName": "Bulk", "Subject": "Thread 2"})
+                .put({"ForumName": "Bulk", "Subject": "Thread 3"})
+                .run()
+            )
+            # Confirm
+            assert 3 == actual["WrittenCount"]
+            assert 1 == actual["RetryCount"]
+            assert 2 == len(calls[1][table.name])
+
+        def test_case_4(self, monkeypatch: MonkeyPatch):
+            """Send the last request of each key with its capacity"""
+
+            # Init modules
+            _, table = self.init
+            client = table.meta.client
+            batch_write_item = client.batch_write_item
+            calls = []
+
+            def counted_batch_write_item(**kwargs):
+                calls.append(kwargs)
+                return batch_write_item(**kwargs)
+
+            monkeypatch.setattr(client, "batch_write_item", counted_batch_write_item)
+            batch = BatchWrite(table)
+            [
+                batch.put({"ForumName": "Bulk", "Subject": f"T{i % 30:02}", "Views": i})
+                for i in range(60)
+            ]
+            # Execute
+            actual = batch.delete({"ForumName": "Bulk", "Subject": "T00"}).run()
+            # Confirm
+            assert 30 == actual["WrittenCount"]
+            assert [25, 5] == [len(x["RequestItems"][table.name]) for x in calls]
+            assert {"TOTAL"} == {x["ReturnConsumedCapacity"] for x in calls}
+            items = Query(table).partition_key_exp(Key("ForumName").eq("Bulk")).run()
+            assert 29 == len(items)
+            assert {x + 30 for x in range(1, 30)} == {x["Views"] for x in items}
+
+    class TestBatchGet:
+        """BatchGet"""
+
+        def test_case_1(self):
+            """Drop duplicate keys and apply projection"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            actual = (
+                BatchGet(table)
+                .partition_key("ForumName", "Amazon S3")
+                .sort_key(Key("Subject").eq("S3 Thread 2"))
+                .key()
+                .key({"ForumName": "Amazon S3", "Subject": "S3 Thread 2"})
+                .key({"ForumName": "Amazon S3", "Subject": "S3 Thread 9"})
+                .projection_exp("ForumName, Subject, Message")
+                .projection_exp("LastPostedBy, LastPostedDateTime, Views")
+                .run()
+            )
+            # Confirm
+            expected = data.read_json("data/expected_query2", float_as=Decimal)
+            assert expected == actual
+
+        def test_case_2(self, monkeypatch: MonkeyPatch):
+            """Split into chunks of 100 and retry unprocessed keys"""
+
+            # Init modules
+            _, table = self.init
+            batch = BatchWrite(table)
+            [
+                batch.put({"ForumName": "Bulk", "Subject": f"T{i:03}"})
+                for i in range(150)
+            ]
+            batch.run()
+            client = table.meta.client
+            batch_get_item = client.batch_get_item
+            calls = []
+
+            def flaky_batch_get_item(RequestItems, **kwargs):
+                calls.append(len(RequestItems[table.name]["Keys"]))
+                if len(calls) > 2:
+                    return batch_get_item(RequestItems=RequestItems, **kwargs)
+                return {"Responses": {}, "UnprocessedKeys": RequestItems}
+
+            monkeypatch.setattr(client, "batch_get_item", flaky_batch_get_item)
+            # Execute
+            actual = (
+                BatchGet(table)
+                .keys({"ForumName": "Bulk", "Subject": f"T{i:03}"} for i in range(150))
+                .parallel(1)
+                .run()
+            )
+            # Confirm
+            assert 150 == len(actual)
+            assert [100, 100, 100, 50] == calls
+
+    class TestPrepared:
+        """Prepared"""
+
+        def test_case_1(self):
+            """Bind values to a prepared query"""
+
+            # Init modules
+            data, table = self.init
+            prepared = (
+                Query(table)
+                .partition_key_exp(Key("ForumName").eq(Param("forum")))
+                .sort_key_exp(Key("Subject").gte(Param("subject")))
+                .filter_exp(Attr("LastPostedBy").eq("User A"))
+                .filter_exp(Attr("Views").eq(Param("views")))
+                .projection_exp("ForumName, Subject, Message")
+                .projection_exp("LastPostedBy, LastPostedDateTime, Views")
+                .desc()
+                .prepare()
+            )
+            # Execute
+            actual = prepared.run(forum="Amazon S3", subject="S3 Thread 2", views=1)
+            count = prepared.count(forum="Amazon DynamoDB", subject="", views=0)
+            # Confirm
+            expected = data.read_json("data/expected_query2", float_as=Decimal)
+            assert expected == actual
+            assert 2 == count
+
+        def test_case_2(self):
+            """Reject missing bind values and mutation"""
+
+            # Init modules
+            _, table = self.init
+            prepared = (
+                Scan(table).filter_exp(Attr("Views").eq(Param("views"))).prepare()
+            )
+            # Execute & Confirm
+            with raises(ValueError):
+                prepared.run()
+            with raises(AttributeError):
+                prepared._chain = None
+
+    class TestProjection:
+        """Projection"""
+
+        def test_case_1(self):
+            """Share placeholders with conditions"""
+
+            # Execute
+            actual = ChainsConditionBuilder(
+                {
+                    "KeyConditionExpression": Key("ForumName").eq("Amazon S3"),
+                    "ProjectionExpression": "ForumName, Tags[1], Info.Tags[0].Name",
+                }
+            ).boto3_query
+            # Confirm
+            assert "#n0,#n1[1],#n2.#n1[0].#n3" == actual["ProjectionExpression"]
+            assert {
+                "#n0": "ForumName",
+                "#n1": "Tags",
+                "#n2": "Info",
+                "#n3": "Name",
+            } == actual["ExpressionAttributeNames"]
+
+        def test_case_2(self):
+            """Project nested paths and list indexes"""
+
+            # Init modules
+            _, table = self.init
+            (
+                PutItem(table)
+                .partition_key("ForumName", "Amazon S3")
+                .sort_key("Subject", "S3 Thread 3")
+                .attr("Info", {"Tags": [{"Name": "a", "Id": 1}], "Owner": "User A"})
+                .run()
+            )
+            # Execute
+            actual = (
+                Query(table)
+                .partition_key_exp(Key("ForumName").eq("Amazon S3"))
+                .sort_key_exp(Key("Subject").eq("S3 Thread 3"))
+                .projection_exp("Subject, Info.Owner")
+                .run()
+            )
+            # Confirm
+            expected = [{"Subject": "S3 Thread 3", "Info": {"Owner": "User A"}}]
+            assert expected == actual
+
+        def test_case_3(self):
+            """Reject malformed paths"""
+
+            # Execute & Confirm
+            with raises(ValueError):
+                ChainsConditionBuilder({"ProjectionExpression": "Tags[x]"}).boto3_query
+
+    class TestTransactWrite:
+        """TransactWrite"""
+
+        def test_case_1(self):
+            """Put, update, delete and check in one transaction"""
+
+            # Init modules
+            _, table = self.init
+            # Execute
+            actual = (
+                TransactWrite(table)
+                .put(
+                    PutItem(table)
+                    .partition_key("ForumName", "Amazon S3")
+                    .sort_key("Subject", "S3 Thread 3")
+                    .attr("Views", 0)
+                    .condition_exp(Attr("ForumName").not_exists())
+                )
+                .update(
+                    UpdateItem(table)
+                    .attr({"ForumName": "Amazon S3", "Subject": "S3 Thread 2"})
+                    .set("LastPostedBy", "User B")
+                    .add("Views", 4)
+                    .condition_exp(Attr("Views").eq(1))
+                )
+                .delete({"ForumName": "Amazon S3", "Subject": "S3 Thread 1"})
+                .condition_check(
+                    {"ForumName": "Amazon DynamoDB", "Subject": "DynamoDB Thread 1"},
+                    Attr("Views").eq(0),
+                )
+                .run()
+            )
+            # Confirm
+            items = (
+                Query(table)
+                .partition_key_exp(Key("ForumName").eq("Amazon S3"))
+                .projection_exp("Subject, Views, LastPostedBy")
+                .run()
+            )
+            assert 1 == actual["TransactionCount"]
+            assert [
+                {"Subject": "S3 Thread 2", "Views": 5, "LastPostedBy": "User B"},
+                {"Subject": "S3 Thread 3", "Views": 0},
+            ] == items
+
+        def test_case_2(self):
+            """Write nothing when a condition fails"""
+
+            # Init modules
+            data, table = self.init
+            # Execute
+            with raises(ClientError) as e:
+                (
+                    TransactWrite(table)
+                    .put({"ForumName": "Amazon S3", "Subject": "S3 Thread 3"})
+                    .condition_check(
+                        {"ForumName": "Amazon S3", "Subject": "S3 Thread 1"},
+                        Attr("Views").eq(9),
+                    )
+                    .run()
+                )
+            # Confirm
+            assert "TransactionCanceledException" == e.typename
+            expected = data.read_json("data/expected_scan1", float_as=Decimal)
+            assert expected == Scan(table).run()
+
+        def test_case_3(self, monkeypatch: MonkeyPatch):
+            """Retry conflicts and split into groups of 100"""
+
+            # Init modules
+            _, table = self.init
+            client = table.meta.client
+            transact_write_items = client.transact_write_items
+            calls = []
+
+            def conflicting_transact_write_items(**kwargs):
+                calls.append(kwargs)
+                if len(calls) == 1:
+                    error = {
+                        "Error": {"Code": "TransactionCanceledException"},
+                        "CancellationReasons": [
+                            {"Code": "None"},
+                            {"Code": "TransactionConflict"},
+                        ],
+                    }
+                    raise ClientError(error, "TransactWriteItems")
+                return transact_write_items(**kwargs)
+
+            monkeypatch.setattr(
+                client, "transact_write_items", conflicting_transact_write_items
+            )
+            transaction = TransactWrite(table)
+            [
+                transaction.put({"ForumName": "Bulk", "Subject": f"T{i:03}"})
+                for i in range(150)
+            ]
+            # Execute
+            actual = transaction.run()
+            # Confirm
+            assert 2 == actual["TransactionCount"]
+            assert 1 == actual["RetryCount"]
+            assert [100, 100, 50] == [len(x["TransactItems"]) for x in calls]
+            assert calls[0]["ClientRequestToken"] == calls[1]["ClientRequestToken"]
+            assert (
+                150
+                == Query(table).partition_key_exp(Key("ForumName").eq("Bulk")).count()
+            )
+
+        def test_case_4(self):
+            """Require values to update a key dict"""
+
+            # Init modules
+            _, table = self.init
+            # Execute
+            with raises(ValueError) as e:
+                TransactWrite(table).update(
+                    {"ForumName": "Amazon S3", "Subject": "S3 Thread 1"}
+                )
+            # Confirm
+            assert "values should be given with a key dict." == str(e.value)
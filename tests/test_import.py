@@ -0,0 +1,71 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Seconds, measured on the best of a few runs so a busy host does not fail it
+PACKAGE_BUDGET = 0.02
+BUILDERS_BUDGET = 0.1
+
+PROBE = """
+import json, sys
+from time import perf_counter
+import boto3.dynamodb.conditions  # paid by the application either way
+start = perf_counter()
+import src.awschains
+package = perf_counter() - start
+loaded = sorted(m for m in sys.modules if m.startswith("src.awschains."))
+start = perf_counter()
+src.awschains.{name}
+builders = perf_counter() - start
+print(json.dumps({{
+    "package": package,
+    "builders": builders,
+    "loaded": loaded,
+    "after": sorted(m for m in sys.modules if m.startswith("src.awschains.")),
+}}))
+"""
+
+
+def probe(name: str):
+    results = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, "-c", PROBE.format(name=name)],
+                cwd=ROOT,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(3)
+    ]
+    return results[-1] | {
+        "package": min(result["package"] for result in results),
+        "builders": min(result["builders"] for result in results),
+    }
+
+
+class TestImport:
+    """Import"""
+
+    def test_case_1(self):
+        """Import the package without loading any module"""
+
+        # Execute
+        actual = probe("__name__")
+        # Confirm
+        assert [] == actual["loaded"]
+        assert actual["package"] < PACKAGE_BUDGET
+
+    def test_case_2(self):
+        """Load the builders without the optional subsystems"""
+
+        # Execute
+        actual = probe("Query")
+        # Confirm
+        expected = ["src.awschains.conditions", "src.awschains.dynamochain"]
+        assert expected == actual["after"]
+        assert actual["builders"] < BUILDERS_BUDGET
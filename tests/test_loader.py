@@ -0,0 +1,118 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from threading import current_thread, main_thread
+
+from pytest import MonkeyPatch
+
+from src.awschains.dynamochain import PutItem
+from src.awschains.loader import BatchLoader
+
+
+class TestBatchLoader:
+    """Batch Loader"""
+
+    def count_calls(self, monkeypatch: MonkeyPatch):
+        _, table = self.init
+        client = table.meta.client
+        batch_get_item = client.batch_get_item
+        calls = []
+
+        def counted_batch_get_item(**kwargs):
+            calls.append(kwargs)
+            return batch_get_item(**kwargs)
+
+        monkeypatch.setattr(client, "batch_get_item", counted_batch_get_item)
+        return calls
+
+    def test_case_1(self, monkeypatch: MonkeyPatch):
+        """Coalesce lookups from many threads"""
+
+        # Init modules
+        data, table = self.init
+        calls = self.count_calls(monkeypatch)
+        loader = BatchLoader(table, window=0.05)
+        keys = [
+            {"ForumName": "Amazon S3", "Subject": "S3 Thread 1"},
+            {"ForumName": "Amazon S3", "Subject": "S3 Thread 2"},
+            {"ForumName": "Amazon S3", "Subject": "S3 Thread 9"},
+        ] * 4
+        # Execute
+        with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+            actual = list(executor.map(loader.load, keys))
+        # Confirm
+        expected = data.read_json("data/expected_scan1", float_as=Decimal)[2:]
+        assert (expected + [None]) * 4 == actual
+        assert 1 == len(calls)
+        assert 3 == len(calls[0]["RequestItems"][table.name]["Keys"])
+
+    def test_case_2(self, monkeypatch: MonkeyPatch):
+        """Flush when the batch is full"""
+
+        # Init modules
+        _, table = self.init
+        calls = self.count_calls(monkeypatch)
+        loader = BatchLoader(table, window=60, max_batch_size=2).projection_exp("Views")
+        # Execute
+        actual = loader.load_many(
+            [
+                PutItem(table)
+                .partition_key("ForumName", "Amazon S3")
+                .sort_key("Subject", "S3 Thread 2"),
+                {"ForumName": "Amazon DynamoDB", "Subject": "DynamoDB Thread 1"},
+            ]
+        )
+        # Confirm
+        assert [1, 0] == [item["Views"] for item in actual]
+        assert 1 == len(calls)
+
+    def test_case_3(self):
+        """Await lookups from coroutines"""
+
+        # Init modules
+        _, table = self.init
+        loader = BatchLoader(table)
+
+        async def gather():
+            return await asyncio.gather(
+                *[
+                    loader.load_async({"ForumName": "Amazon S3", "Subject": subject})
+                    for subject in ["S3 Thread 1", "S3 Thread 2"]
+                ]
+            )
+
+        # Execute
+        actual = asyncio.run(gather())
+        # Confirm
+        assert ["S3 Thread 1", "S3 Thread 2"] == [item["Subject"] for item in actual]
+
+    def test_case_4(self, monkeypatch: MonkeyPatch):
+        """Load full batches off the event loop"""
+
+        # Init modules
+        _, table = self.init
+        calls = self.count_calls(monkeypatch)
+        loader = BatchLoader(table, window=60, max_batch_size=2)
+        load = loader._load
+        threads = []
+
+        def recorded_load(batch):
+            threads.append(current_thread())
+            load(batch)
+
+        monkeypatch.setattr(loader, "_load", recorded_load)
+
+        async def gather():
+            return await asyncio.gather(
+                *[
+                    loader.load_async({"ForumName": "Amazon S3", "Subject": subject})
+                    for subject in ["S3 Thread 1", "S3 Thread 2"]
+                ]
+            )
+
+        # Execute
+        actual = asyncio.run(gather())
+        # Confirm
+        assert ["S3 Thread 1", "S3 Thread 2"] == [item["Subject"] for item in actual]
+        assert 1 == len(calls)
+        assert main_thread() not in threads
@@ -0,0 +1,138 @@
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+from pytest import fixture, raises
+
+from src.awschains.combiner import UpdateCombiner
+from src.awschains.dynamochain import PutItem, Query, Scan, UpdateItem
+from src.awschains.memory import PAGE_BYTES, MemoryTable, item_size
+
+
+@fixture
+def memory_table():
+    import data
+
+    table = MemoryTable("memory_table", "ForumName", "Subject")
+    [
+        PutItem(table).attr(item).run()
+        for item in data.read_json("database/database", float_as=Decimal)
+    ]
+    return table
+
+
+class TestMemoryTable:
+    """Memory Table"""
+
+    def test_case_1(self, memory_table):
+        """Answer chains like DynamoDB"""
+
+        # Init modules
+        _, table = self.init
+        chains = [
+            lambda t: Scan(t),
+            lambda t: Scan(t)
+            .filter_exp(
+                Attr("Subject").begins_with("S3") | Attr("Tags").contains("index")
+            )
+            .filter_exp(~Attr("Views").between(1, 5))
+            .projection_exp("Subject, Views"),
+            lambda t: Query(t)
+            .partition_key_exp(Key("ForumName").eq("Amazon S3"))
+            .sort_key_exp(Key("Subject").gte("S3 Thread 2"))
+            .filter_exp(Attr("LastPostedBy").eq("User A"))
+            .projection_exp("Subject, Views"),
+            lambda t: Query(t)
+            .partition_key_exp(Key("ForumName").eq("Amazon DynamoDB"))
+            .sort_key_exp(Key("Subject").between("DynamoDB Thread 1", "DynamoDB Z"))
+            .filter_exp(Attr("Message").size().gt(3) & Attr("Views").is_in([0, 9]))
+            .desc()
+            .limit(1),
+            lambda t: Query(t)
+            .partition_key_exp(Key("ForumName").eq("Missing"))
+            .filter_exp(Attr("Answered").not_exists()),
+        ]
+        # Execute
+        actual = [chain(memory_table).run() for chain in chains]
+        # Confirm
+        expected = [chain(table).run() for chain in chains]
+        assert expected == actual
+        assert 3 == Scan(memory_table).filter_exp(Attr("Views").lt(1)).limit(1).count()
+        # moto drops list elements from projections, so these are checked as is
+        projected = Scan(memory_table).projection_exp("Subject, Tags[1]").run()
+        assert {"Subject": "DynamoDB Thread 1", "Tags": ["primarykey"]} == projected[0]
+
+    def test_case_2(self):
+        """Page at 1 MB and resume from LastEvaluatedKey"""
+
+        # Init modules
+        table = MemoryTable("memory_table", "ForumName", "Subject")
+        items = [
+            {"ForumName": f"Forum {i % 3}", "Subject": f"{i:04}", "Body": "x" * 1000}
+            for i in range(3000)
+        ]
+        [table.put_item(Item=item) for item in items]
+        # Execute
+        pages = list(Scan(table).iter())
+        segments = [Scan(table).count(total_segments=4), Scan(table).limit(7).count()]
+        descending = list(
+            Query(table)
+            .partition_key_exp(Key("ForumName").eq("Forum 1"))
+            .sort_key_exp(Key("Subject").lt("0100"))
+            .desc()
+            .limit(10)
+            .iter()
+        )
+        # Confirm
+        assert 3 == len(pages)
+        assert all(
+            PAGE_BYTES <= sum(map(item_size, page["Items"])) < PAGE_BYTES + 1100
+            for page in pages[:-1]
+        )
+        assert "LastEvaluatedKey" not in pages[-1]
+        assert 3000 == sum(page["Count"] for page in pages)
+        assert [3000, 3000] == segments
+        subjects = [item["Subject"] for page in descending for item in page["Items"]]
+        assert [f"{i:04}" for i in range(97, 0, -3)] == subjects
+        assert 4 == len(descending)
+
+    def test_case_3(self, memory_table):
+        """Apply conditional writes and updates"""
+
+        # Init modules
+        key = {"ForumName": "Amazon S3", "Subject": "S3 Thread 2"}
+        # Execute
+        with raises(ClientError) as e:
+            PutItem(memory_table).attr(key).condition_exp(
+                Attr("ForumName").not_exists()
+            ).run()
+        with UpdateCombiner(memory_table, window=60) as combiner:
+            [combiner.add(key, "Views") for _ in range(10)]
+            combiner.add(key, "Labels", {"hot"})
+        actual = (
+            UpdateItem(memory_table)
+            .attr(key)
+            .set("LastPostedBy", "User B")
+            .remove("Tags")
+            .condition_exp(Attr("Views").eq(11))
+            .return_values("UPDATED_NEW")
+            .run()
+        )
+        # Confirm
+        assert "ConditionalCheckFailedException" == e.value.response["Error"]["Code"]
+        assert {"LastPostedBy": "User B"} == actual
+        item = memory_table.get_item(Key=key)["Item"]
+        assert (11, {"hot"}, False) == (item["Views"], item["Labels"], "Tags" in item)
+
+    def test_case_4(self, memory_table):
+        """Reject expressions it cannot answer"""
+
+        # Execute / Confirm
+        with raises(ValueError):
+            memory_table.scan(FilterExpression="Views >")
+        with raises(ValueError):
+            Query(memory_table).partition_key_exp(
+                Key("Subject").eq("S3 Thread 1")
+            ).run()
+        with raises(ClientError):
+            Scan(memory_table).index_name("ByUser").run()
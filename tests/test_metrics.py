@@ -0,0 +1,88 @@
+from boto3.dynamodb.conditions import Attr, Key
+
+from src.awschains.dynamochain import PutItem, Query, Scan
+from src.awschains.metrics import (
+    MetricsCollector,
+    add_observer,
+    percentile,
+    remove_observer,
+)
+
+
+class TestMetrics:
+    """Metrics"""
+
+    def test_case_1(self):
+        """Report every page to the observer"""
+
+        # Init modules
+        _, table = self.init
+        events = []
+        # Execute
+        (
+            Scan(table)
+            .filter_exp(Attr("Views").eq(1))
+            .limit(2)
+            .observe(events.append)
+            .run()
+        )
+        # Confirm
+        assert 2 == len(events)
+        assert 1 == sum(event["Count"] for event in events)
+        assert all(event["Count"] <= event["ScannedCount"] for event in events)
+        assert {"Scan"} == {event["Operation"] for event in events}
+        assert all(0 < event["WallTime"] for event in events)
+        assert all(0 == event["RetryCount"] for event in events)
+        assert 0 < events[0]["BuildTime"]
+        assert 0 == events[1]["BuildTime"]
+
+    def test_case_2(self):
+        """Aggregate percentiles and scanned ratio"""
+
+        # Init modules
+        _, table = self.init
+        collector = MetricsCollector()
+        add_observer(collector)
+        # Execute
+        try:
+            Scan(table).filter_exp(Attr("Views").eq(1)).run()
+            (
+                Query(table)
+                .partition_key_exp(Key("ForumName").eq("Amazon S3"))
+                .return_consumed_capacity("TOTAL")
+                .run()
+            )
+            PutItem(table).attr({"ForumName": "Bulk", "Subject": "Thread 1"}).run()
+        finally:
+            remove_observer(collector)
+        actual = collector.summary()
+        # Confirm
+        assert {"Scan", "Query", "PutItem"} == set(actual)
+        assert 4 == actual["Scan"]["ScannedRatio"]
+        assert 0 < actual["Query"]["ConsumedCapacityUnits"]
+        assert actual["PutItem"]["P50"] == actual["PutItem"]["P99"]
+
+    def test_case_3(self):
+        """Nearest-rank percentile"""
+
+        # Execute & Confirm
+        values = list(range(1, 101))
+        assert 50 == percentile(values, 0.5)
+        assert 99 == percentile(values, 0.99)
+        assert 1 == percentile(values, 0)
+        assert percentile([], 0.5) is None
+
+    def test_case_4(self):
+        """Keep the most recent samples"""
+
+        # Init modules
+        collector = MetricsCollector(max_samples=2)
+        # Execute
+        [
+            collector({"Operation": "Scan", "WallTime": wall_time})
+            for wall_time in [5, 5, 1, 2]
+        ]
+        actual = collector.summary()
+        # Confirm
+        assert 4 == actual["Scan"]["Requests"]
+        assert 2 == actual["Scan"]["P99"]
@@ -0,0 +1,102 @@
+from boto3.dynamodb.conditions import Attr
+from pytest import raises
+
+from src.awschains.dynamochain import PutItem, Query, Scan
+
+
+class TestPlanner:
+    """Planner"""
+
+    def test_case_1(self, indexed_table):
+        """Rewrite a partition key filter as a table Query"""
+
+        # Init modules
+        scan = (
+            Scan(indexed_table)
+            .filter_exp(Attr("ForumName").eq("Forum 1"))
+            .filter_exp(Attr("Subject").begins_with("Thread"))
+            .filter_exp(Attr("Views").gt(1))
+        )
+        # Execute
+        actual = scan.planned()
+        # Confirm
+        assert isinstance(actual, Query)
+        assert {
+            "Operation": "Query",
+            "IndexName": None,
+            "PartitionKey": "ForumName",
+            "SortKey": "Subject",
+            "FilterConditions": 1,
+        } == scan.explain()
+        assert ["Thread 3", "Thread 5"] == [x["Subject"] for x in actual.run()]
+
+    def test_case_2(self, indexed_table):
+        """Pick a covering index"""
+
+        # Init modules
+        scan = (
+            Scan(indexed_table)
+            .filter_exp(Attr("LastPostedBy").eq("User 1"))
+            .filter_exp(Attr("LastPostedDateTime").exists())
+            .projection_exp("ForumName, Subject")
+            .auto_plan()
+        )
+        # Execute
+        actual = scan.run()
+        # Confirm
+        assert "ByUser" == scan.explain()["IndexName"]
+        assert ["Thread 1", "Thread 4"] == [x["Subject"] for x in actual]
+
+    def test_case_3(self, indexed_table):
+        """Keep the Scan when no index applies"""
+
+        # Execute
+        uncovered = (
+            Scan(indexed_table)
+            .filter_exp(Attr("LastPostedBy").eq("User 1"))
+            .auto_plan()
+        )
+        unpinned = Scan(indexed_table).filter_exp(Attr("Views").gt(3))
+        # Confirm
+        assert "Scan" == uncovered.explain()["Operation"]
+        assert 2 == len(uncovered.run())
+        assert unpinned is unpinned.planned()
+
+    def test_case_4(self, indexed_table):
+        """Read the approximate count from the table description"""
+
+        # Execute
+        actual = Scan(indexed_table).count(approximate=True)
+        # Confirm
+        assert 6 == actual
+        with raises(ValueError):
+            Scan(indexed_table).index_name("Missing").count(approximate=True)
+
+    def test_case_5(self, indexed_table):
+        """Keep the Scan when an index would drop items"""
+
+        # Init modules
+        PutItem(indexed_table).attr(
+            {"ForumName": "Forum 1", "Subject": "Thread 7", "LastPostedBy": "User 1"}
+        ).run()
+        sparse = (
+            Scan(indexed_table)
+            .filter_exp(Attr("LastPostedBy").eq("User 1"))
+            .projection_exp("ForumName, Subject")
+            .auto_plan()
+        )
+        pinned = (
+            Scan(indexed_table)
+            .index_name("ByUser")
+            .filter_exp(Attr("ForumName").eq("Forum 1"))
+            .auto_plan()
+        )
+        # Execute
+        actual = sparse.run()
+        # Confirm
+        assert "Scan" == sparse.explain()["Operation"]
+        assert ["Thread 1", "Thread 4", "Thread 7"] == sorted(
+            x["Subject"] for x in actual
+        )
+        assert "Scan" == pinned.explain()["Operation"]
+        assert 3 == len(pinned.run())
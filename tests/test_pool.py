@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from threading import Barrier
+
+from pytest import MonkeyPatch
+
+from src.awschains.dynamochain import BatchWrite, Scan
+from src.awschains.pool import ClientPool, clear_pools, get_pool, pooled_table
+
+
+class TestClientPool:
+    """Client Pool"""
+
+    def test_case_1(self):
+        """Share one client between thread-local tables"""
+
+        # Init modules
+        data, table = self.init
+        pool = ClientPool()
+        pooled = pool.table(table.name)
+        barrier = Barrier(4)
+
+        def resolve(_):
+            # Hold every worker so each thread resolves its own table
+            barrier.wait()
+            return pooled.meta.client, pool._local_table(table.name)
+
+        # Execute
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            resolved = list(executor.map(resolve, range(4)))
+        actual = Scan(pooled).run()
+        # Confirm
+        expected = data.read_json("data/expected_scan1", float_as=Decimal)
+        assert expected == actual
+        assert {id(pool.client)} == {id(client) for client, _ in resolved}
+        assert 4 == len({id(local) for _, local in resolved})
+
+    def test_case_2(self):
+        """Size the pool to the parallel workers"""
+
+        # Init modules
+        _, table = self.init
+        pool = ClientPool(max_pool_connections=2)
+        pooled = pool.table(table.name)
+        assert "standard" == pool.client.meta.config.retries["mode"]
+        writer = BatchWrite(pooled).parallel(16)
+        [writer.put({"ForumName": "Pool", "Subject": f"T{i:03}"}) for i in range(100)]
+        # Execute
+        writer.run()
+        # Confirm
+        config = pool.client.meta.config
+        assert 17 == config.max_pool_connections
+        assert "adaptive" == config.retries["mode"]
+        assert config.tcp_keepalive
+        assert 104 == Scan(pooled).count()
+
+    def test_case_3(self):
+        """Keep one pool per endpoint"""
+
+        # Init modules
+        _, table = self.init
+        clear_pools()
+        # Execute
+        actual = pooled_table(table.name)
+        # Confirm
+        assert actual.pool is get_pool()
+        assert actual.pool is not get_pool(endpoint_url="http://localhost:8000")
+        assert 4 == Scan(actual).count()
+        clear_pools()
+
+    def test_case_4(self, monkeypatch: MonkeyPatch):
+        """Close the replaced client once its calls finish"""
+
+        # Init modules
+        _, table = self.init
+        pool = ClientPool()
+        pooled = pool.table(table.name)
+        client = pool.client
+        closed = []
+        during_call = []
+
+        def reserve_during_call(**kwargs):
+            pool.reserve(4)
+            during_call.append(len(closed))
+
+        monkeypatch.setattr(client, "close", lambda: closed.append(client))
+        client.meta.events.register("before-call.dynamodb", reserve_during_call)
+        # Execute
+        actual = Scan(pooled).count()
+        # Confirm
+        assert 4 == actual
+        assert [0] == during_call
+        assert [client] == closed
+        assert pool.client is not client
+        assert 4 == Scan(pooled).count()
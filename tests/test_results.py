@@ -0,0 +1,85 @@
+from array import array
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import Key
+from pytest import importorskip, raises
+
+from src.awschains.dynamochain import Query, Scan
+from src.awschains.results import pack_column, record_type
+
+
+class TestResults:
+    """Result Modes"""
+
+    def test_case_1(self):
+        """Records shaped by the projection"""
+
+        # Init modules
+        _, table = self.init
+        # Execute
+        actual = (
+            Query(table)
+            .partition_key_exp(Key("ForumName").eq("Amazon S3"))
+            .projection_exp("Subject, Views, Missing")
+            .run_records()
+        )
+        # Confirm
+        cls = record_type(("Subject", "Views", "Missing"))
+        expected = [cls("S3 Thread 1", 0, None), cls("S3 Thread 2", 1, None)]
+        assert expected == actual
+        assert "S3 Thread 2" == actual[1].Subject == actual[1]["Subject"]
+        assert {"Subject": "S3 Thread 1", "Views": 0} == actual[0].to_dict()
+        assert not hasattr(actual[0], "__dict__")
+
+    def test_case_2(self):
+        """Columns in batches with packed numbers"""
+
+        # Init modules
+        _, table = self.init
+        # Execute
+        actual = list(
+            Scan(table).projection_exp("Subject, Views, Tags").iter_columns(3)
+        )
+        # Confirm
+        assert [3, 1] == [len(batch["Subject"]) for batch in actual]
+        assert array("q", [0, 0, 0]) == actual[0]["Views"]
+        assert isinstance(actual[0]["Tags"], list)
+
+    def test_case_3(self):
+        """Pack numeric columns"""
+
+        # Execute & Confirm
+        assert array("q", [1, 2]) == pack_column([Decimal(1), 2])
+        assert array("d", [1.5, 2.0]) == pack_column([Decimal("1.5"), 2])
+        assert [True, 1] == pack_column([True, 1])
+        assert ["a", 1] == pack_column(["a", 1])
+        actual = pack_column([1, None])
+        assert "d" == actual.typecode and actual[1] != actual[1]
+
+    def test_case_4(self):
+        """Require a projection and return empty columns"""
+
+        # Init modules
+        _, table = self.init
+        # Execute
+        actual = (
+            Query(table)
+            .partition_key_exp(Key("ForumName").eq("Missing"))
+            .projection_exp("Subject")
+            .run_columns()
+        )
+        # Confirm
+        assert {"Subject": []} == actual
+        with raises(ValueError):
+            Scan(table).run_records()
+
+    def test_case_5(self):
+        """Pack columns into NumPy arrays"""
+
+        # Init modules
+        numpy = importorskip("numpy")
+        _, table = self.init
+        # Execute
+        actual = Scan(table).projection_exp("Views").run_columns(use_numpy=True)
+        # Confirm
+        assert numpy.int64 == actual["Views"].dtype
@@ -0,0 +1,135 @@
+from time import monotonic
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+from pytest import MonkeyPatch, raises
+
+from src.awschains.dynamochain import BatchWrite, PutItem, Scan
+from src.awschains.throttle import ThroughputController, controller_for
+
+
+class TestThroughputController:
+    """Throughput Controller"""
+
+    def test_case_1(self, monkeypatch: MonkeyPatch):
+        """Retry throttled calls and cut concurrency"""
+
+        # Init modules
+        _, table = self.init
+        scan = table.scan
+        calls = []
+
+        def throttled_scan(**kwargs):
+            calls.append(kwargs)
+            if len(calls) <= 2:
+                error = {"Error": {"Code": "ProvisionedThroughputExceededException"}}
+                raise ClientError(error, "Scan")
+            return scan(**kwargs)
+
+        monkeypatch.setattr(table, "scan", throttled_scan)
+        controller = ThroughputController(max_concurrency=8)
+        # Execute
+        actual = Scan(table).throttle(controller).count()
+        # Confirm
+        assert 4 == actual
+        assert 3 == len(calls)
+        assert "TOTAL" == calls[0]["ReturnConsumedCapacity"]
+        assert 2 == controller.throttled
+        assert 2 == controller.concurrency
+
+    def test_case_2(self):
+        """Pace writes against the capacity budget"""
+
+        # Init modules
+        _, table = self.init
+        controller = ThroughputController(write_capacity=20)
+        # Execute
+        start = monotonic()
+        [
+            PutItem(table)
+            .throttle(controller)
+            .attr({"ForumName": "Bulk", "Subject": f"Thread {i}"})
+            .run()
+            for i in range(30)
+        ]
+        actual = monotonic() - start
+        # Confirm
+        assert 0.4 < actual
+
+    def test_case_3(self):
+        """Raise errors other than throttling"""
+
+        # Init modules
+        _, table = self.init
+        controller = ThroughputController()
+        # Execute
+        with raises(ClientError) as e:
+            (
+                PutItem(table)
+                .throttle(controller)
+                .attr({"ForumName": "Amazon S3", "Subject": "S3 Thread 1"})
+                .condition_exp(Attr("ForumName").not_exists())
+                .run()
+            )
+        # Confirm
+        assert "ConditionalCheckFailedException" == e.typename
+        assert 0 == controller.throttled
+
+    def test_case_4(self):
+        """Share one controller per table"""
+
+        # Execute
+        actual = controller_for("shared_table", read_capacity=10)
+        # Confirm
+        assert actual is controller_for("shared_table")
+        assert actual is not controller_for("other_table")
+
+    def test_case_5(self, monkeypatch: MonkeyPatch):
+        """Cut concurrency when botocore retried the call"""
+
+        # Init modules
+        _, table = self.init
+        scan = table.scan
+
+        def retried_scan(**kwargs):
+            response = scan(**kwargs)
+            response["ResponseMetadata"]["RetryAttempts"] = 2
+            return response
+
+        monkeypatch.setattr(table, "scan", retried_scan)
+        controller = ThroughputController(max_concurrency=8)
+        # Execute
+        actual = Scan(table).throttle(controller).count()
+        # Confirm
+        assert 4 == actual
+        assert 1 == controller.throttled
+        assert 4 == controller.concurrency
+
+    def test_case_6(self, monkeypatch: MonkeyPatch):
+        """Cut concurrency on unprocessed batch items"""
+
+        # Init modules
+        _, table = self.init
+        client = table.meta.client
+        batch_write_item = client.batch_write_item
+        calls = []
+
+        def flaky_batch_write_item(RequestItems, **kwargs):
+            calls.append(RequestItems)
+            if len(calls) > 2:
+                return batch_write_item(RequestItems=RequestItems, **kwargs)
+            return {"UnprocessedItems": RequestItems}
+
+        monkeypatch.setattr(client, "batch_write_item", flaky_batch_write_item)
+        controller = ThroughputController(max_concurrency=8)
+        # Execute
+        actual = (
+            BatchWrite(table)
+            .throttle(controller)
+            .put({"ForumName": "Bulk", "Subject": "Thread 1"})
+            .run()
+        )
+        # Confirm
+        assert 1 == actual["WrittenCount"]
+        assert 2 == controller.throttled
+        assert 2 == controller.concurrency